@@ -0,0 +1,104 @@
+import argparse
+import sys
+from dataclasses import fields
+from pathlib import Path
+
+from bench import inline
+from bench.corpus import CorpusSpec, write_corpus
+from bench.memory import MAX_RSS_GROWTH_KB_PER_PAGE, check_memory, rss_growth, run_memory
+from bench.results import compare_results, load_results, make_results, save_results
+from bench.stages import run_stages
+
+
+def add_spec_arguments(parser):
+    for spec_field in fields(CorpusSpec):
+        parser.add_argument(
+            f"--{spec_field.name.replace('_', '-')}",
+            type=type(spec_field.default),
+            default=spec_field.default,
+        )
+
+
+def spec_from_args(args):
+    return CorpusSpec(**{spec_field.name: getattr(args, spec_field.name) for spec_field in fields(CorpusSpec)})
+
+
+def report_regressions(regressions, tolerance):
+    for stage, metric, base, current, ratio in regressions:
+        print(f"REGRESSION {stage} {metric}: {base:.6g} -> {current:.6g} ({ratio:.2f}x, tolerance {tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+def report_memory(results, max_growth):
+    if len(results) > 1:
+        growth = rss_growth(results)
+        print(f"Growth: {growth['peak_rss_kb']:.2f} KB rss, {growth['peak_worker_rss_kb']:.2f} KB workers per page")
+    problems = check_memory(results, max_growth)
+    for key, growth in problems:
+        print(f"MEMORY {key}: grows {growth:.2f} KB per page (limit {max_growth:g})")
+    return 1 if problems else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["inline"]:
+        return inline.main(argv[1:])
+
+    parser = argparse.ArgumentParser(prog="bench", description="Benchmark the site generator stages.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    corpus_parser = commands.add_parser("corpus", help="write a synthetic site to a directory")
+    corpus_parser.add_argument("directory", type=Path)
+    add_spec_arguments(corpus_parser)
+
+    run_parser = commands.add_parser("run", help="time parse, render and build stages on a synthetic site")
+    add_spec_arguments(run_parser)
+    run_parser.add_argument("--stages", nargs="+")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--output", type=Path, help="write results as JSON")
+    run_parser.add_argument("--baseline", type=Path, help="compare results against a stored JSON file")
+    run_parser.add_argument("--tolerance", type=float, default=0.2)
+
+    compare_parser = commands.add_parser("compare", help="compare two JSON result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--tolerance", type=float, default=0.2)
+
+    memory_parser = commands.add_parser("memory", help="peak RSS of full builds as the site grows")
+    add_spec_arguments(memory_parser)
+    memory_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    memory_parser.add_argument("--jobs", type=int, default=1)
+    memory_parser.add_argument("--max-in-flight", type=int)
+    memory_parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=MAX_RSS_GROWTH_KB_PER_PAGE,
+        help="KB of peak RSS allowed per added page; the in-memory manifest alone costs about 3.3 KB per page",
+    )
+
+    commands.add_parser("inline", help="inline tokenizer scaling micro-benchmark", add_help=False)
+
+    args = parser.parse_args(argv)
+    match args.command:
+        case "corpus":
+            write_corpus(args.directory, spec_from_args(args))
+            return 0
+        case "run":
+            spec = spec_from_args(args)
+            results = make_results(spec, run_stages(spec, args.repeat, args.stages))
+            if args.output:
+                save_results(args.output, results)
+            if args.baseline:
+                regressions = compare_results(load_results(args.baseline), results, args.tolerance)
+                return report_regressions(regressions, args.tolerance)
+            return 0
+        case "memory":
+            results = run_memory(spec_from_args(args), args.sizes, jobs=args.jobs, max_in_flight=args.max_in_flight)
+            return report_memory(results, args.max_growth)
+        case "compare":
+            regressions = compare_results(load_results(args.baseline), load_results(args.current), args.tolerance)
+            return report_regressions(regressions, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+import random
+from dataclasses import asdict, dataclass
+
+WORDS = [
+    "the",
+    "ring",
+    "hobbit",
+    "elf",
+    "dwarf",
+    "wizard",
+    "shire",
+    "mordor",
+    "river",
+    "forest",
+    "mountain",
+    "road",
+    "tale",
+    "song",
+    "king",
+    "queen",
+    "light",
+    "shadow",
+    "fire",
+    "water",
+    "stone",
+    "star",
+    "tree",
+    "horse",
+    "sword",
+    "shield",
+    "ship",
+    "sea",
+    "night",
+    "morning",
+    "journey",
+    "return",
+]
+
+TEMPLATE_HTML = """<!doctype html>
+<html>
+
+<head>
+    <meta charset="utf-8" />
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+</head>
+
+<body>
+    <article>{{ Content }}</article>
+</body>
+
+</html>
+"""
+
+
+@dataclass
+class CorpusSpec:
+    pages: int = 100
+    sections: int = 4
+    paragraphs: int = 3
+    paragraph_words: int = 80
+    link_density: float = 0.05
+    image_density: float = 0.01
+    list_items: int = 8
+    code_blocks: int = 1
+    images: int = 10
+    pages_per_dir: int = 100
+    seed: int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def page_path(spec, index):
+    return f"section{index // spec.pages_per_dir}/page{index}/index.md"
+
+
+def inline_text(rng, spec, words):
+    parts = []
+    for _ in range(words):
+        roll = rng.random()
+        word = rng.choice(WORDS)
+        if roll < spec.link_density:
+            target = rng.randrange(spec.pages)
+            parts.append(f"[{word}](/{page_path(spec, target).removesuffix('/index.md')})")
+        elif roll < spec.link_density + spec.image_density:
+            parts.append(f"![{word}](/images/image{rng.randrange(spec.images)}.png)")
+        elif roll < 0.9:
+            parts.append(word)
+        elif roll < 0.95:
+            parts.append(f"**{word}**")
+        elif roll < 0.98:
+            parts.append(f"_{word}_")
+        else:
+            parts.append(f"`{word}`")
+    return " ".join(parts)
+
+
+def page_markdown(rng, spec, index):
+    blocks = [f"# Page {index} {rng.choice(WORDS)}"]
+    for section in range(spec.sections):
+        blocks.append(f"## Section {section} {rng.choice(WORDS)}")
+        blocks.extend(inline_text(rng, spec, spec.paragraph_words) for _ in range(spec.paragraphs))
+        if spec.list_items:
+            marker = "- {1}" if section % 2 == 0 else "{0}. {1}"
+            blocks.append(
+                "\n".join(marker.format(item + 1, inline_text(rng, spec, 8)) for item in range(spec.list_items)),
+            )
+        if section < spec.code_blocks:
+            blocks.append("```\n" + "\n".join(f"let {word} = {i};" for i, word in enumerate(WORDS[:6])) + "\n```")
+        blocks.append("> " + inline_text(rng, spec, 20))
+    return "\n\n".join(blocks) + "\n"
+
+
+def iter_pages(spec):
+    rng = random.Random(spec.seed)
+    for index in range(spec.pages):
+        yield page_path(spec, index), page_markdown(rng, spec, index)
+
+
+def write_corpus(root, spec):
+    for rel_path, markdown in iter_pages(spec):
+        path = root / "content" / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(markdown)
+
+    rng = random.Random(spec.seed)
+    (root / "static" / "images").mkdir(parents=True, exist_ok=True)
+    (root / "static" / "index.css").write_text("body {\n    margin: 0 auto;\n    max-width: 40em;\n}\n")
+    for index in range(spec.images):
+        (root / "static" / "images" / f"image{index}.png").write_bytes(rng.randbytes(4096))
+    (root / "template.html").write_text(TEMPLATE_HTML)
+    return root
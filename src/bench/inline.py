@@ -0,0 +1,74 @@
+import argparse
+import re
+import timeit
+
+from textnode import MD_IMG_FORMAT, MD_IMG_RE_PATTERN, MD_LINK_FORMAT, MD_LINK_RE_PATTERN, TextNode, TextType
+
+
+def link_paragraph(links):
+    return " and ".join(f"see [link {i}](/page/{i}) or ![image {i}](/images/{i}.png)" for i in range(links))
+
+
+def legacy_split_nodes_pattern(old_nodes, pattern, text_type, text_format):
+    new_nodes = []
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+        else:
+            node_text = node.text
+            while len(node_text) > 0:
+                items = re.findall(pattern, node_text)
+                if items:
+                    item = items[0]
+                    item_text = text_format.format(*item)
+                    pos = node_text.find(item_text)
+                    if pos > 0:
+                        new_nodes.append(TextNode(node_text[:pos], TextType.TEXT))
+                    new_nodes.append(TextNode(item[0], text_type, item[1]))
+                    node_text = node_text[pos + len(item_text) :]
+                else:
+                    new_nodes.append(TextNode(node_text, TextType.TEXT))
+                    break
+    return new_nodes
+
+
+def legacy_from_text(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = TextNode.split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = TextNode.split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = TextNode.split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = legacy_split_nodes_pattern(nodes, MD_IMG_RE_PATTERN, TextType.IMAGE, MD_IMG_FORMAT)
+    return legacy_split_nodes_pattern(nodes, MD_LINK_RE_PATTERN, TextType.LINK, MD_LINK_FORMAT)
+
+
+def measure(func, text, repeat):
+    number = 1
+    while timeit.timeit(lambda: func(text), number=number) < 0.05:
+        number *= 2
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=repeat)) / number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure inline parsing cost on link-heavy paragraphs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400, 800, 1600, 3200])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy", action="store_true", help="also time the original findall/find pipeline")
+    args = parser.parse_args(argv)
+
+    header = f"{'links':>8} {'from_text ms':>14} {'us/link':>10}"
+    if args.legacy:
+        header += f" {'legacy ms':>12} {'us/link':>10}"
+    print(header)
+    for size in args.sizes:
+        text = link_paragraph(size)
+        elapsed = measure(TextNode.from_text, text, args.repeat)
+        row = f"{size:>8} {elapsed * 1e3:>14.3f} {elapsed * 1e6 / size:>10.3f}"
+        if args.legacy:
+            elapsed = measure(legacy_from_text, text, args.repeat)
+            row += f" {elapsed * 1e3:>12.3f} {elapsed * 1e6 / size:>10.3f}"
+        print(row)
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import dataclasses
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from bench.corpus import write_corpus
+
+MAX_RSS_GROWTH_KB_PER_PAGE = 4
+
+MEASURE_SCRIPT = """
+import contextlib, json, os, resource, sys, time
+import main
+options = json.loads(sys.argv[1])
+start = time.perf_counter()
+with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+    main.build(**options)
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "peak_worker_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+}))
+"""
+
+
+def measure_build(root, **options):
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1])}
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE_SCRIPT, json.dumps(options)],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def run_memory(spec, sizes, **options):
+    results = {}
+    for pages in sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = write_corpus(Path(tmpdir), dataclasses.replace(spec, pages=pages))
+            result = results[pages] = measure_build(root, **options)
+        print(
+            f"{pages:>10} pages {result['seconds']:>10.2f} s"
+            f" {result['peak_rss_kb'] / 1024:>10.1f} MB rss {result['peak_worker_rss_kb'] / 1024:>10.1f} MB workers",
+        )
+    return results
+
+
+def rss_growth(results):
+    sizes = sorted(results)
+    first, last = results[sizes[0]], results[sizes[-1]]
+    return {key: (last[key] - first[key]) / (sizes[-1] - sizes[0]) for key in ("peak_rss_kb", "peak_worker_rss_kb")}
+
+
+def check_memory(results, max_growth=MAX_RSS_GROWTH_KB_PER_PAGE):
+    if len(results) < 2:
+        return []
+    return [(key, growth) for key, growth in rss_growth(results).items() if growth > max_growth]
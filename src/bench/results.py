@@ -0,0 +1,39 @@
+import json
+import platform
+
+RESULTS_VERSION = 1
+
+
+def make_results(spec, stages):
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "corpus": spec.to_dict(),
+        "stages": stages,
+    }
+
+
+def load_results(path):
+    data = json.loads(path.read_text())
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError("unsupported results version", path)
+    return data
+
+
+def save_results(path, results):
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def compare_results(baseline, current, tolerance=0.2):
+    if baseline["corpus"] != current["corpus"]:
+        raise ValueError("results were measured on different corpora")
+
+    regressions = []
+    for stage, base in sorted(baseline["stages"].items()):
+        if stage not in current["stages"]:
+            continue
+        for metric, value in sorted(base.items()):
+            ratio = current["stages"][stage][metric] / value if value else 1.0
+            if ratio > 1 + tolerance:
+                regressions.append((stage, metric, value, current["stages"][stage][metric], ratio))
+    return regressions
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import main
+from bench.corpus import iter_pages, write_corpus
+from blocknode import BlockNode
+from textnode import TextNode
+
+
+def measure(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def bench_parse_inline(documents):
+    paragraphs = [block.text.replace("\n", " ") for doc in documents for block in BlockNode.blocks_from_text(doc)]
+
+    def run():
+        for text in paragraphs:
+            TextNode.from_text(text)
+
+    return run
+
+
+def bench_parse_blocks(documents):
+    def run():
+        for doc in documents:
+            BlockNode.from_document(doc)
+
+    return run
+
+
+def bench_render(documents):
+    trees = [BlockNode.from_document(doc) for doc in documents]
+
+    def run():
+        for tree in trees:
+            tree.to_html()
+
+    return run
+
+
+def bench_build(root, **options):
+    def run():
+        with contextlib.chdir(root), contextlib.redirect_stdout(io.StringIO()):
+            main.PATH_MANIFEST.unlink(missing_ok=True)
+            main.build(**options)
+
+    return run
+
+
+def bench_rebuild(root, **options):
+    def run():
+        with contextlib.chdir(root), contextlib.redirect_stdout(io.StringIO()):
+            main.build(**options)
+
+    return run
+
+
+def run_stages(spec, repeat=3, stages=None):
+    documents = [markdown for _, markdown in iter_pages(spec)]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = write_corpus(Path(tmpdir), spec)
+        benchmarks = {
+            "parse_inline": lambda: bench_parse_inline(documents),
+            "parse_blocks": lambda: bench_parse_blocks(documents),
+            "render": lambda: bench_render(documents),
+            "build": lambda: bench_build(root),
+            "rebuild": lambda: bench_rebuild(root),
+        }
+        for name, factory in benchmarks.items():
+            if stages and name not in stages:
+                continue
+            result = results[name] = measure(factory(), repeat)
+            print(f"{name:>14} {result['seconds'] * 1e3:>10.2f} ms {result['peak_bytes'] / 1e6:>10.2f} MB")
+    return results
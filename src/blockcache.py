@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from metadata import PageMetadata
+
+BLOCK_CACHE_VERSION = 5
+DEFAULT_MAX_SIZE = 64 << 20
+ENTRY_OVERHEAD = 256
+
+_SHARED_CACHES = {}
+
+
+class BlockCache:
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, path=None):
+        self.max_size = max_size
+        self.path = path
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"BlockCache(entries={len(self.entries)}, size={self.size}, max_size={self.max_size}, path={self.path})"
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def shared(cls, max_size=DEFAULT_MAX_SIZE, path=None):
+        key = (max_size, path)
+        if key not in _SHARED_CACHES:
+            _SHARED_CACHES[key] = cls(max_size, path)
+        return _SHARED_CACHES[key]
+
+    @staticmethod
+    def key(block, resolve_url=None, terms=False):
+        url_key = "" if resolve_url is None else resolve_url.cache_key
+        kind = f"{block.block_type.value}+terms" if terms else block.block_type.value
+        digest = hashlib.sha256(f"{BLOCK_CACHE_VERSION}\0{url_key}\0{kind}\0{block.text}".encode())
+        return digest.hexdigest()
+
+    def disk_path(self, key):
+        return self.path / key[:2] / f"{key[2:]}.json"
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        if self.path is not None:
+            try:
+                data = json.loads(self.disk_path(key).read_text())
+            except FileNotFoundError:
+                return None
+            entry = (data["html"], PageMetadata.from_dict(data["metadata"]))
+            self.disk_hits += 1
+            self._insert(key, entry)
+        return entry
+
+    @staticmethod
+    def entry_size(entry):
+        html, metadata = entry
+        return len(html) + metadata.size() + ENTRY_OVERHEAD
+
+    def _insert(self, key, entry):
+        if self.entry_size(entry) > self.max_size:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= self.entry_size(old)
+        self.entries[key] = entry
+        self.size += self.entry_size(entry)
+        while self.size > self.max_size:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= self.entry_size(evicted)
+
+    def put(self, key, entry):
+        self._insert(key, entry)
+        if self.path is not None:
+            path = self.disk_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            html, metadata = entry
+            tmp_path.write_text(json.dumps({"html": html, "metadata": metadata.to_dict()}))
+            tmp_path.replace(path)
+
+    def render(self, block, resolve_url=None, metadata=None):
+        terms = metadata is not None and metadata.terms is not None
+        key = self.key(block, resolve_url, terms)
+        entry = self.get(key)
+        if entry is None:
+            self.misses += 1
+            block_metadata = PageMetadata(terms={} if terms else None)
+            entry = (block.to_parent(resolve_url, block_metadata).to_html(), block_metadata)
+            self.put(key, entry)
+        if metadata is not None:
+            metadata.extend(entry[1])
+        return entry[0]
@@ -1,11 +1,14 @@
 import re
 from dataclasses import dataclass
 from enum import Enum
+from itertools import chain
 
 from htmlnode import LeafNode, ParentNode
+from metadata import heading_props
 from textnode import TextNode
 
 MD_HEADING_RE_PATTERN = r"^#{1,6} [\S\s]+"
+MD_HEADING_RE = re.compile(MD_HEADING_RE_PATTERN)
 
 
 class BlockType(Enum):
@@ -17,99 +20,111 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockNode:
     text: str
     block_type: BlockType
 
     @staticmethod
-    def get_block_type(text):
-        if re.match(MD_HEADING_RE_PATTERN, text):
+    def get_block_type(text, lines=None):
+        if MD_HEADING_RE.match(text):
             return BlockType.HEADING
 
         if text.startswith("```") and text.endswith("```"):
             return BlockType.CODE
 
-        lines = text.split("\n")
+        quote = unordered = ordered = True
+        for item_count, line in enumerate(text.split("\n") if lines is None else lines, 1):
+            quote = quote and line.startswith(">")
+            unordered = unordered and line.startswith("- ")
+            ordered = ordered and line.startswith(f"{item_count}. ")
+            if not (quote or unordered or ordered):
+                return BlockType.PARAGRAPH
 
-        if all(line.startswith(">") for line in lines):
+        if quote:
             return BlockType.QUOTE
-
-        if all(line.startswith("- ") for line in lines):
+        if unordered:
             return BlockType.UNORDERED_LIST
-
-        item_count = 1
-        ordered = True
-        for line in lines:
-            if not line.startswith(f"{item_count}. "):
-                ordered = False
-                break
-            item_count += 1
-        if ordered:
-            return BlockType.ORDERED_LIST
-
-        return BlockType.PARAGRAPH
+        return BlockType.ORDERED_LIST
 
     @classmethod
     def from_text(cls, text):
         return cls(text, cls.get_block_type(text))
 
+    @classmethod
+    def from_lines(cls, lines):
+        start, end = 0, len(lines)
+        while start < end and lines[start].isspace():
+            start += 1
+        while end > start and lines[end - 1].isspace():
+            end -= 1
+        if start == end:
+            return None
+
+        lines = lines[start:end]
+        lines[0] = lines[0].lstrip()
+        lines[-1] = lines[-1].rstrip()
+        text = "\n".join(lines)
+        return cls(text, cls.get_block_type(text, lines))
+
+    @classmethod
+    def iter_blocks(cls, lines):
+        block_lines = []
+        for raw_line in chain(lines, ("",)):
+            line = raw_line.removesuffix("\n")
+            if line:
+                block_lines.append(line)
+            elif block_lines:
+                block = cls.from_lines(block_lines)
+                block_lines = []
+                if block:
+                    yield block
+
     @classmethod
     def blocks_from_text(cls, text):
-        return [cls.from_text(block.strip()) for block in text.split("\n\n") if block]
+        return list(cls.iter_blocks(text.split("\n")))
 
     @classmethod
-    def from_document(cls, text):
+    def from_document(cls, text, resolve_url=None, metadata=None):
+        lines = text.split("\n") if isinstance(text, str) else text
         return ParentNode(
             "div",
-            [block.to_parent() for block in cls.blocks_from_text(text)],
+            [block.to_parent(resolve_url, metadata) for block in cls.iter_blocks(lines)],
         )
 
-    def to_parent(self):
+    def layout(self):
         match self.block_type:
             case BlockType.PARAGRAPH:
-                text = " ".join(self.text.split("\n"))
-                return ParentNode(
-                    "p",
-                    [node.to_leaf() for node in TextNode.from_text(text)],
-                )
+                return "p", None, [" ".join(self.text.split("\n"))]
             case BlockType.HEADING:
                 heading, title = self.text.strip().split("# ", maxsplit=1)
-                level = 1 + len(heading)
-                return ParentNode(
-                    f"h{level}",
-                    [node.to_leaf() for node in TextNode.from_text(title.strip())],
-                )
+                return f"h{1 + len(heading)}", None, [title.strip()]
             case BlockType.CODE:
                 text = "\n".join(line for line in self.text.removeprefix("```").removesuffix("```").split("\n") if line)
-                return ParentNode("pre", [LeafNode("code", text)])
+                return "pre", "code", [text]
             case BlockType.QUOTE:
-                text = "\n".join([line.removeprefix(">").strip() for line in self.text.split("\n")])
-                return ParentNode(
+                return (
                     "blockquote",
-                    [node.to_leaf() for node in TextNode.from_text(text)],
+                    None,
+                    ["\n".join([line.removeprefix(">").strip() for line in self.text.split("\n")])],
                 )
             case BlockType.UNORDERED_LIST:
-                return ParentNode(
-                    "ul",
-                    [
-                        ParentNode(
-                            "li",
-                            [node.to_leaf() for node in TextNode.from_text(line.removeprefix("- ").strip())],
-                        )
-                        for line in self.text.split("\n")
-                    ],
-                )
+                return "ul", "li", [line.removeprefix("- ").strip() for line in self.text.split("\n")]
             case BlockType.ORDERED_LIST:
-                return ParentNode(
-                    "ol",
-                    [
-                        ParentNode(
-                            "li",
-                            [node.to_leaf() for node in TextNode.from_text(line.split(". ", maxsplit=1)[1].strip())],
-                        )
-                        for line in self.text.split("\n")
-                    ],
-                )
+                return "ol", "li", [line.split(". ", maxsplit=1)[1].strip() for line in self.text.split("\n")]
             case _:
                 raise ValueError("invalid block type")
+
+    def to_parent(self, resolve_url=None, metadata=None):
+        tag, item_tag, texts = self.layout()
+        if self.block_type == BlockType.CODE:
+            items = [[LeafNode(item_tag, texts[0])]]
+        else:
+            items = [[node.to_leaf(resolve_url) for node in TextNode.from_text(text)] for text in texts]
+        leaves = [(leaf.tag, leaf.value, leaf.props) for leaf_nodes in items for leaf in leaf_nodes]
+        if metadata is not None:
+            metadata.add_block(tag, leaves)
+
+        if item_tag and self.block_type != BlockType.CODE:
+            return ParentNode(tag, [ParentNode(item_tag, leaves) for leaves in items])
+        return ParentNode(tag, items[0], heading_props(tag, leaves))
@@ -0,0 +1,39 @@
+import argparse
+import json
+import socket
+import sys
+
+DEFAULT_SOCKET = ".cache/build.sock"
+NO_REPLY = {"ok": False, "output": "", "error": "the daemon closed the connection without replying\n"}
+
+
+def send_request(socket_path, request):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as fp:
+            line = fp.readline()
+    return json.loads(line) if line.strip() else NO_REPLY
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ask a running build daemon (main.py --daemon) to rebuild the site.")
+    parser.add_argument("basepath", nargs="?", help="URL prefix for site-absolute links (defaults to the daemon's)")
+    parser.add_argument("--page", action="append", help="only regenerate this content file (repeatable)")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket the daemon listens on")
+    parser.add_argument("--shutdown", action="store_true", help="stop the daemon")
+    args = parser.parse_args(argv)
+
+    request = {"command": "shutdown"} if args.shutdown else {"command": "build", "basepath": args.basepath}
+    if args.page:
+        request["pages"] = args.page
+    response = send_request(args.socket, request)
+    sys.stdout.write(response["output"])
+    if not response["ok"]:
+        sys.stderr.write(response["error"])
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+import gzip
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import PurePosixPath
+
+from output import temp_path
+
+GZIP_SUFFIXES = frozenset((".css", ".html", ".js", ".json", ".svg", ".txt", ".xml"))
+GZIP_LEVEL = 9
+
+
+def is_compressible(rel_path):
+    return PurePosixPath(rel_path).suffix in GZIP_SUFFIXES
+
+
+def gzip_path(path):
+    return path.with_name(f"{path.name}.gz")
+
+
+def gzip_file(path):
+    dest_path = gzip_path(path)
+    tmp_path = temp_path(dest_path)
+    try:
+        with (
+            path.open("rb") as src,
+            tmp_path.open("wb") as raw,
+            gzip.GzipFile("", "wb", GZIP_LEVEL, raw, mtime=0) as dst,
+        ):
+            shutil.copyfileobj(src, dst)
+        tmp_path.replace(dest_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path.stat().st_size, dest_path.stat().st_size
+
+
+def gzip_files(paths, jobs=1):
+    if jobs <= 1 or len(paths) <= 1:
+        return list(map(gzip_file, paths))
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(gzip_file, paths, chunksize=max(1, len(paths) // (4 * jobs))))
@@ -0,0 +1,60 @@
+import contextlib
+import io
+import json
+import os
+import socketserver
+import time
+
+
+def parse_request(line):
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise TypeError("request must be a JSON object", request)
+    return request
+
+
+class BuildRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = parse_request(self.rfile.readline())
+        except (TypeError, ValueError) as exc:
+            response = {"ok": False, "output": "", "error": f"{exc!r}\n"}
+        else:
+            response = self.server.respond(request)
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class BuildDaemon(socketserver.UnixStreamServer):
+    def __init__(self, socket_path, run):
+        self.socket_path = socket_path
+        self.run = run
+        self.stopped = False
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        socket_path.unlink(missing_ok=True)
+        super().__init__(str(socket_path), BuildRequestHandler)
+
+    def respond(self, request):
+        if request.get("command") == "shutdown":
+            self.stopped = True
+            return {"ok": True, "output": "Daemon stopped\n", "error": ""}
+
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            try:
+                self.run(request)
+            except Exception as exc:  # noqa: BLE001
+                error = "".join(f"{line}\n" for line in (repr(exc), *getattr(exc, "__notes__", [])))
+            else:
+                error = ""
+            print(f"Request handled in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return {"ok": not error, "output": output.getvalue(), "error": error}
+
+    def serve(self):
+        print(f"Build daemon listening on {self.socket_path} (pid {os.getpid()})")
+        while not self.stopped:
+            self.handle_request()
+
+    def server_close(self):
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
@@ -0,0 +1,29 @@
+import json
+from pathlib import PurePosixPath
+
+from output import write_if_changed
+
+ASSET_MANIFEST = "assets.json"
+FINGERPRINT_LENGTH = 10
+FINGERPRINTED_SUFFIXES = frozenset(
+    {".css", ".js", ".mjs", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".avif", ".woff", ".woff2"},
+)
+
+
+def is_fingerprinted(rel_path):
+    return PurePosixPath(rel_path).suffix.lower() in FINGERPRINTED_SUFFIXES
+
+
+def fingerprint_name(rel_path, digest):
+    path = PurePosixPath(rel_path)
+    return path.with_name(f"{path.stem}.{digest[:FINGERPRINT_LENGTH]}{path.suffix}").as_posix()
+
+
+def asset_map(static_entries):
+    return {
+        rel_path: entry["output"] for rel_path, entry in sorted(static_entries.items()) if entry["output"] != rel_path
+    }
+
+
+def write_asset_manifest(public_path, assets):
+    return write_if_changed(public_path / ASSET_MANIFEST, [json.dumps(assets, indent=1, sort_keys=True)])
@@ -0,0 +1,195 @@
+from array import array
+from enum import IntEnum
+
+from blocknode import BlockNode, BlockType
+from htmlnode import LeafNode, ParentNode
+from metadata import heading_props
+from textnode import TextNode
+
+
+class NodeKind(IntEnum):
+    PARENT = 0
+    LEAF = 1
+
+
+class FlatDocument:
+    def __init__(self):
+        self.kinds = array("B")
+        self.tag_ids = array("h")
+        self.text_starts = array("q")
+        self.text_ends = array("q")
+        self.ends = array("q")
+        self.props_ids = array("i")
+        self.tags = [None]
+        self.tag_index = {None: 0}
+        self.props = []
+        self.text = ""
+        self._text_parts = []
+        self._text_size = 0
+        self._open = []
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __repr__(self):
+        return f"FlatDocument(nodes={len(self)}, tags={self.tags[1:]}, text_size={len(self.text)})"
+
+    def _append(self, kind, tag, value, props):
+        tag_id = self.tag_index.get(tag)
+        if tag_id is None:
+            tag_id = self.tag_index[tag] = len(self.tags)
+            self.tags.append(tag)
+
+        self.kinds.append(kind)
+        self.tag_ids.append(tag_id)
+        if value is None:
+            self.text_starts.append(-1)
+            self.text_ends.append(-1)
+        else:
+            self._text_parts.append(value)
+            self.text_starts.append(self._text_size)
+            self._text_size += len(value)
+            self.text_ends.append(self._text_size)
+        self.ends.append(len(self.kinds))
+        if props:
+            self.props_ids.append(len(self.props))
+            self.props.append(props)
+        else:
+            self.props_ids.append(-1)
+
+    def open(self, tag, props=None):
+        self._open.append(len(self.kinds))
+        self._append(NodeKind.PARENT, tag, None, props)
+
+    def close(self):
+        self.ends[self._open.pop()] = len(self.kinds)
+
+    def set_props(self, index, props):
+        if props:
+            self.props_ids[index] = len(self.props)
+            self.props.append(props)
+
+    def leaf(self, tag, value, props=None):
+        self._append(NodeKind.LEAF, tag, value, props)
+
+    def inline(self, text, resolve_url=None, leaves=None):
+        for token in TextNode.iter_tokens(text):
+            parts = TextNode.leaf_parts(*token, resolve_url)
+            self.leaf(*parts)
+            if leaves is not None:
+                leaves.append(parts)
+
+    def finish(self):
+        if self._open:
+            raise ValueError("unclosed node", self.tags[self.tag_ids[self._open[-1]]])
+        self.text += "".join(self._text_parts)
+        self._text_parts = []
+        return self
+
+    @classmethod
+    def from_document(cls, text, resolve_url=None, metadata=None):
+        lines = text.split("\n") if isinstance(text, str) else text
+        doc = cls()
+        doc.open("div")
+        for block in BlockNode.iter_blocks(lines):
+            tag, item_tag, texts = block.layout()
+            leaves = []
+            block_index = len(doc)
+            doc.open(tag)
+            if block.block_type == BlockType.CODE:
+                doc.leaf(item_tag, texts[0])
+                leaves.append((item_tag, texts[0], None))
+            elif item_tag:
+                for item_text in texts:
+                    doc.open(item_tag)
+                    doc.inline(item_text, resolve_url, leaves)
+                    doc.close()
+            else:
+                doc.inline(texts[0], resolve_url, leaves)
+                doc.set_props(block_index, heading_props(tag, leaves))
+            doc.close()
+            if metadata is not None:
+                metadata.add_block(tag, leaves)
+        doc.close()
+        return doc.finish()
+
+    @classmethod
+    def from_tree(cls, node):
+        doc = cls()
+        stack = [iter((node,))]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, ParentNode):
+                    doc.open(child.tag, child.props)
+                    stack.append(iter(child.children))
+                    break
+                doc.leaf(child.tag, child.value, child.props)
+            else:
+                stack.pop()
+                if stack:
+                    doc.close()
+        return doc.finish()
+
+    def tag(self, index):
+        return self.tags[self.tag_ids[index]]
+
+    def value(self, index):
+        start = self.text_starts[index]
+        return None if start < 0 else self.text[start : self.text_ends[index]]
+
+    def node_props(self, index):
+        props_id = self.props_ids[index]
+        return None if props_id < 0 else self.props[props_id]
+
+    def children(self, index=0):
+        child = index + 1
+        while child < self.ends[index]:
+            yield child
+            child = self.ends[child]
+
+    def to_tree(self, index=0):
+        nodes = [None] * len(self)
+        for i in reversed(range(index, self.ends[index])):
+            if self.kinds[i] == NodeKind.PARENT:
+                nodes[i] = ParentNode(self.tag(i), [nodes[child] for child in self.children(i)], self.node_props(i))
+            else:
+                nodes[i] = LeafNode(self.tag(i), self.value(i), self.node_props(i))
+        return nodes[index]
+
+    def props_html(self, index):
+        props = self.node_props(index)
+        if not props:
+            return ""
+        html = []
+        for k, v in props.items():
+            if not isinstance(v, bool):
+                html.append(f' {k}="{v}"')
+            elif v:
+                html.append(f" {k}")
+        return "".join(html)
+
+    def iter_html(self, index=0):
+        closing = []
+        for i in range(index, self.ends[index]):
+            while closing and closing[-1][0] <= i:
+                yield closing.pop()[1]
+            tag = self.tag(i)
+            if self.kinds[i] == NodeKind.PARENT:
+                if not tag:
+                    raise ValueError("missing tag")
+                if self.ends[i] == i + 1:
+                    raise ValueError("missing children")
+                yield f"<{tag}{self.props_html(i)}>"
+                closing.append((self.ends[i], f"</{tag}>"))
+            elif tag:
+                yield f"<{tag}{self.props_html(i)}>{self.value(i)}</{tag}>"
+            else:
+                yield self.value(i)
+        while closing:
+            yield closing.pop()[1]
+
+    def to_html(self, index=0):
+        return "".join(self.iter_html(index))
+
+    def write_html(self, fp, index=0):
+        fp.writelines(self.iter_html(index))
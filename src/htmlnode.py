@@ -1,8 +1,15 @@
-from dataclasses import dataclass
+import sys
 from typing import Self
 
 
+def intern_tag(tag: str | None):
+    return sys.intern(tag) if tag else tag
+
+
 class HTMLNode:
+    __slots__ = ("children", "props", "tag", "value")
+    __hash__ = None
+
     def __init__(
         self,
         tag: str | None = None,
@@ -10,7 +17,7 @@ class HTMLNode:
         children: list[Self] | None = None,
         props: dict[str, str | bool] | None = None,
     ):
-        self.tag = tag
+        self.tag = intern_tag(tag)
         self.value = value
         self.children = children
         self.props = props
@@ -26,44 +33,82 @@ class HTMLNode:
             and (self.props == other.props)
         )
 
-    def to_html(self):
+    def iter_html(self):
         raise NotImplementedError
 
-    def props_to_html(self):
-        html = ""
+    def to_html(self):
+        return "".join(self.iter_html())
+
+    def write_html(self, fp):
+        fp.writelines(self.iter_html())
+
+    def iter_props_html(self):
         if self.props:
             for k, v in self.props.items():
                 if not isinstance(v, bool):
-                    html += f' {k}="{v}"'
+                    yield f' {k}="{v}"'
                 elif v:
-                    html += f" {k}"
-        return html
+                    yield f" {k}"
+
+    def props_to_html(self):
+        return "".join(self.iter_props_html())
 
 
-@dataclass
 class ParentNode(HTMLNode):
-    tag: str
-    children: list[HTMLNode]
-    props: dict[str, str | bool] | None = None
+    __slots__ = ()
+    __hash__ = None
 
-    def to_html(self):
+    def __init__(self, tag: str, children: list[HTMLNode], props: dict[str, str | bool] | None = None):
+        super().__init__(tag, None, children, props)
+
+    def __repr__(self):
+        return f"ParentNode(tag={self.tag!r}, children={self.children!r}, props={self.props!r})"
+
+    def __eq__(self, other: Self):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.tag, self.children, self.props) == (other.tag, other.children, other.props)
+
+    def open_html(self):
         if not self.tag:
             raise ValueError("missing tag")
         if not self.children:
             raise ValueError("missing children")
+        return f"<{self.tag}{self.props_to_html()}>"
 
-        html = f"<{self.tag}{self.props_to_html()}>"
-        for child in self.children:
-            html += child.to_html()
-        html += f"</{self.tag}>"
-        return html
+    def iter_html(self):
+        yield self.open_html()
+        stack = [(iter(self.children), f"</{self.tag}>")]
+        while stack:
+            children, close_html = stack[-1]
+            for child in children:
+                if isinstance(child, ParentNode):
+                    yield child.open_html()
+                    stack.append((iter(child.children), f"</{child.tag}>"))
+                    break
+                yield from child.iter_html()
+            else:
+                stack.pop()
+                yield close_html
 
 
-@dataclass
 class LeafNode(HTMLNode):
-    tag: str | None
-    value: str | None
-    props: dict[str, str | bool] | None = None
+    __slots__ = ()
+    __hash__ = None
+
+    def __init__(self, tag: str | None, value: str | None, props: dict[str, str | bool] | None = None):
+        super().__init__(tag, value, None, props)
+
+    def __repr__(self):
+        return f"LeafNode(tag={self.tag!r}, value={self.value!r}, props={self.props!r})"
+
+    def __eq__(self, other: Self):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.tag, self.value, self.props) == (other.tag, other.value, other.props)
+
+    def iter_html(self):
+        yield self.to_html()
 
     def to_html(self):
         return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>" if self.tag else self.value
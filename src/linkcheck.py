@@ -0,0 +1,59 @@
+import json
+from urllib.parse import urljoin, urlsplit
+
+
+def output_urls(output, resolve_url):
+    url = resolve_url(f"/{output}")
+    if url.endswith("/index.html"):
+        directory = url.removesuffix("index.html")
+        return (directory, url, directory.rstrip("/") or "/")
+    if url.endswith(".html"):
+        return (url, url.removesuffix(".html"))
+    return (url,)
+
+
+def link_targets(pages, static, resolve_url):
+    targets = {}
+    for entry in static.values():
+        for url in output_urls(entry["output"], resolve_url):
+            targets[url] = None
+    for entry in pages.values():
+        anchors = frozenset(heading[2] for heading in entry["metadata"]["headings"] if heading[2])
+        for url in output_urls(entry["output"], resolve_url):
+            targets[url] = anchors
+    return targets
+
+
+def split_url(url, page_url):
+    if not url.startswith("/") or url.startswith("//"):
+        parts = urlsplit(url)
+        if parts.scheme or parts.netloc:
+            return None, None
+        url = urljoin(page_url, url)
+    path, _, fragment = url.partition("#")
+    return path.partition("?")[0] or page_url, fragment
+
+
+def check_links(pages, static, resolve_url):
+    targets = link_targets(pages, static, resolve_url)
+    problems = []
+    checked = 0
+    for rel_path, entry in sorted(pages.items()):
+        metadata = entry["metadata"]
+        page_url = output_urls(entry["output"], resolve_url)[0]
+        for kind, urls in (("link", metadata["links"]), ("image", metadata["images"])):
+            for url in urls:
+                path, fragment = split_url(url, page_url)
+                if path is None or not path.startswith(resolve_url.basepath):
+                    continue
+                checked += 1
+                if path not in targets:
+                    problems.append({"page": rel_path, "kind": kind, "url": url, "reason": "missing"})
+                elif fragment and (targets[path] is None or fragment not in targets[path]):
+                    problems.append({"page": rel_path, "kind": kind, "url": url, "reason": "anchor"})
+    return checked, problems
+
+
+def write_report(path, checked, problems):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"checked": checked, "broken": problems}, indent=1))
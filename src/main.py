@@ -1,56 +1,728 @@
+import argparse
+import contextlib
+import functools
+import itertools
+import os
 import pathlib
-import shutil
 import sys
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
 
+from blockcache import DEFAULT_MAX_SIZE, BlockCache
 from blocknode import BlockNode
+from client import DEFAULT_SOCKET
+from compress import gzip_files, gzip_path, is_compressible
+from daemon import BuildDaemon
+from fingerprint import asset_map, write_asset_manifest
+from flatdoc import FlatDocument
+from htmlnode import ParentNode
+from linkcheck import check_links, write_report
+from manifest import Manifest, file_hash, source_entry
+from metadata import PageMetadata
+from minify import HTMLMinifier
+from output import same_contents, write_if_changed
+from profiler import NULL_PROFILER, Profiler
+from publish import rollback, staged
+from search import update_search_index
+from shard import SHARD_MANIFEST, load_shards, parse_shard, shard_of
+from staticsync import copy_file, static_entries, sync_static
+from template import Template
+from urls import URLResolver
+from watch import serve, snapshot, try_build, watch
 
 PATH_TEMPLATE = pathlib.Path("./template.html")
 PATH_CONTENT = pathlib.Path("./content")
 PATH_STATIC = pathlib.Path("./static")
 PATH_PUBLIC = pathlib.Path("./docs")
+PATH_MANIFEST = pathlib.Path("./.cache/manifest.json")
+PATH_PROFILE = pathlib.Path("./.cache/profile.json")
+PATH_LINK_REPORT = pathlib.Path("./.cache/linkcheck.json")
+PATH_SOCKET = pathlib.Path(DEFAULT_SOCKET)
 
+PAGE_MEMORY_FACTOR = 8
+DEFAULT_IN_FLIGHT_PER_JOB = 8
+DEFAULT_MEMORY_BUDGET = 256 << 20
+BLOCK_CACHE_BUDGET_SHARE = 16
 
-def generate_page(from_path, template_path, dest_path, basepath="/"):
+
+def render_content(lines, resolve_url=None, flat=False, block_cache=None, profiler=NULL_PROFILER, *, search=False):
+    metadata = PageMetadata(terms={} if search else None)
+    if flat:
+        with profiler.stage("parse"):
+            doc = FlatDocument.from_document(lines, resolve_url, metadata)
+        return metadata, doc.iter_html()
+
+    blocks = profiler.iterate("parse_blocks", BlockNode.iter_blocks(lines))
+    if block_cache is None:
+        with profiler.stage("parse_inline"):
+            doc = ParentNode("div", [block.to_parent(resolve_url, metadata) for block in blocks])
+        return metadata, doc.iter_html()
+
+    with profiler.stage("render_blocks"):
+        fragments = ["<div>"]
+        fragments.extend(block_cache.render(block, resolve_url, metadata) for block in blocks)
+        fragments.append("</div>")
+    return metadata, fragments
+
+
+def generate_page(
+    from_path,
+    template_path,
+    dest_path,
+    basepath="/",
+    *,
+    resolve_url=None,
+    flat=False,
+    block_cache=None,
+    minify=False,
+    search=False,
+    profiler=NULL_PROFILER,
+):
     print(f"Generating page from {from_path} to {dest_path} using {template_path}")
 
-    content_md = from_path.read_text()
-    doc = BlockNode.from_document(content_md)
+    if resolve_url is None:
+        resolve_url = URLResolver(basepath)
+    with profiler.page(from_path), from_path.open() as fp:
+        lines = profiler.iterate("read", fp)
+        metadata, content_chunks = render_content(lines, resolve_url, flat, block_cache, profiler, search=search)
+        if metadata.title is None:
+            raise ValueError("missing h1 heading", from_path)
 
-    title_nodes = [node for node in doc.children if node.tag == "h1"]
-    if not title_nodes:
-        raise ValueError("missing h1 heading", from_path)
+        content_html = profiler.iterate("serialize", content_chunks)
+        with profiler.stage("template"):
+            template = Template.load(template_path, resolve_url)
+        page_chunks = profiler.iterate("template", template.iter_render(Title=metadata.title, Content=content_html))
+        minifier = HTMLMinifier() if minify else None
+        if minifier:
+            page_chunks = profiler.iterate("minify", minifier.iter_minify(page_chunks))
+
+        with profiler.stage("write"):
+            written = write_if_changed(dest_path, page_chunks)
+        return written, metadata, [minifier.input_size, minifier.output_size] if minifier else None
+
+
+def generate_page_job(job):
+    from_path, template_path, dest_path, basepath, options, profile = job
+    profiler = Profiler() if profile else NULL_PROFILER
+    block_cache = options.get("block_cache")
+    options = {**options, "block_cache": BlockCache.shared(*block_cache) if block_cache else None}
+    try:
+        written, metadata, minified = generate_page(
+            from_path,
+            template_path,
+            dest_path,
+            basepath,
+            profiler=profiler,
+            **options,
+        )
+    except Exception as exc:
+        exc.add_note(f"while generating page from {from_path}")
+        raise
+    entry = {"metadata": metadata.to_dict()}
+    if minified:
+        entry["minified"] = minified
+    return written, entry, profiler.pages if profile else None
+
+
+def generate_page_batch(batch):
+    return [generate_page_job(job) for job in batch]
+
+
+def budget_block_cache(block_cache, memory_budget):
+    if not block_cache or not memory_budget:
+        return block_cache
+    max_size, path = block_cache
+    return min(max_size, memory_budget // BLOCK_CACHE_BUDGET_SHARE), path
+
+
+def generate_pages(pages, entries, jobs=1, profiler=NULL_PROFILER, *, max_in_flight=None, memory_budget=None):
+    written = set()
+    changed = set()
+
+    def collect(batch, results):
+        for page, (page_written, page_entry, page_profiles) in zip(batch, results, strict=True):
+            if page_written:
+                written.add(str(page[2]))
+            rel_path = page[0].relative_to(PATH_CONTENT).as_posix()
+            entries[rel_path].update(page_entry)
+            changed.add(rel_path)
+            if page_profiles:
+                profiler.merge(page_profiles)
+
+    if jobs <= 1:
+        for page in pages:
+            collect((page,), (generate_page_job(page),))
+        return written, changed
+
+    max_in_flight = max_in_flight or DEFAULT_IN_FLIGHT_PER_JOB * jobs
+    batch_size = max(1, max_in_flight // (2 * jobs))
+    in_flight = {}
+    in_flight_pages = in_flight_bytes = 0
+
+    def collect_done(return_when):
+        nonlocal in_flight_pages, in_flight_bytes
+        done, _ = wait(in_flight, return_when=return_when)
+        for future in done:
+            batch, batch_bytes = in_flight.pop(future)
+            in_flight_pages -= len(batch)
+            in_flight_bytes -= batch_bytes
+            collect(batch, future.result())
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for batch in itertools.batched(pages, batch_size):
+            batch_bytes = PAGE_MEMORY_FACTOR * sum(page[0].stat().st_size for page in batch)
+            while in_flight and (
+                in_flight_pages + len(batch) > max_in_flight
+                or (memory_budget and in_flight_bytes + batch_bytes > memory_budget)
+            ):
+                collect_done(FIRST_COMPLETED)
+            in_flight[executor.submit(generate_page_batch, batch)] = (batch, batch_bytes)
+            in_flight_pages += len(batch)
+            in_flight_bytes += batch_bytes
+        while in_flight:
+            collect_done(ALL_COMPLETED)
+    return written, changed
+
+
+def iter_sources(root, suffix):
+    for dir_path, dir_names, file_names in root.walk():
+        dir_names.sort()
+        for name in sorted(file_names):
+            if name.endswith(suffix):
+                yield dir_path / name
+
+
+def iter_page_jobs(public_path, manifest, old_manifest, *, rebuild_all, page_options, profile):
+    for from_path in iter_sources(PATH_CONTENT, ".md"):
+        rel_path = from_path.relative_to(PATH_CONTENT)
+        if manifest.shard and shard_of(rel_path, manifest.shard[1]) != manifest.shard[0]:
+            continue
+        old_entry = old_manifest.pages.get(rel_path.as_posix())
+        entry = {"output": rel_path.with_suffix(".html").as_posix(), **source_entry(from_path, old_entry)}
+        manifest.pages[rel_path.as_posix()] = entry
+        dest_path = public_path / entry["output"]
+        if (
+            rebuild_all
+            or not old_entry
+            or old_entry.get("hash") != entry["hash"]
+            or "metadata" not in old_entry
+            or ("minified" in old_entry) != page_options.get("minify", False)
+            or (page_options.get("search", False) and "terms" not in old_entry["metadata"])
+            or not dest_path.exists()
+        ):
+            yield from_path, PATH_TEMPLATE, dest_path, manifest.basepath, page_options, profile
+        else:
+            entry["metadata"] = old_entry["metadata"]
+            if not page_options.get("search", False):
+                entry["metadata"].pop("terms", None)
+            if "minified" in old_entry:
+                entry["minified"] = old_entry["minified"]
+
+
+def gzip_key(entry):
+    return f"{entry['hash']}:minified" if "minified" in entry else entry["hash"]
+
+
+def compress_outputs(public_path, manifest, old_manifest, written, jobs=1):
+    paths = []
+    for entries, old_entries in ((manifest.static, old_manifest.static), (manifest.pages, old_manifest.pages)):
+        for rel_path, entry in entries.items():
+            if not is_compressible(entry["output"]):
+                continue
+            entry["gzip"] = gzip_key(entry)
+            dest_path = public_path / entry["output"]
+            old_entry = old_entries.get(rel_path, {})
+            if str(dest_path) in written or old_entry.get("gzip") != entry["gzip"] or not gzip_path(dest_path).exists():
+                paths.append(dest_path)
+    return gzip_files(paths, jobs)
+
+
+def remove_output(public_path, rel_path):
+    print(f"Removing stale output {rel_path}")
+    dest_path = public_path / rel_path
+    dest_path.unlink(missing_ok=True)
+    for parent in dest_path.parents:
+        if parent == public_path or not parent.exists() or any(parent.iterdir()):
+            break
+        parent.rmdir()
+
+
+def load_manifest(manifest_path, public_path):
+    old_manifest = Manifest.load(manifest_path)
+    if old_manifest is not None:
+        return old_manifest, old_manifest.outputs()
+
+    old_outputs = {
+        path.relative_to(public_path).as_posix()
+        for path in public_path.glob("**/*")
+        if path.is_file() and path != manifest_path
+    }
+    return Manifest(), old_outputs
+
+
+def copy_static(public_path, manifest, old_manifest, link, *, fingerprint, minify, profiler):
+    with profiler.stage("static"):
+        manifest.static, copied = sync_static(
+            PATH_STATIC,
+            public_path,
+            old_manifest.static,
+            link,
+            fingerprint=fingerprint,
+            minify=minify,
+        )
+        if fingerprint:
+            manifest.assets = asset_map(manifest.static)
+        if manifest.assets:
+            write_asset_manifest(public_path, manifest.assets)
+    print(f"Static files: {copied} copied, {len(manifest.static) - copied} unchanged")
+
+
+def write_search(public_path, manifest, old_manifest, changed, *, rebuild, profiler):
+    with profiler.stage("search"):
+        manifest.search, written = update_search_index(
+            public_path,
+            manifest.pages,
+            old_manifest.pages,
+            changed,
+            resolve_url=URLResolver(manifest.basepath, manifest.assets),
+            old_files=old_manifest.search,
+            rebuild=rebuild,
+        )
+    print(f"Search index: {written} written, {len(manifest.search) - written} unchanged")
+
+
+def compress_site(public_path, manifest, old_manifest, written, *, jobs, profiler):
+    with profiler.stage("compress"):
+        sizes = compress_outputs(public_path, manifest, old_manifest, written, jobs)
+    raw_size, gz_size = sum(size for size, _ in sizes), sum(gz for _, gz in sizes)
+    print(f"Compressed {len(sizes)} files: {raw_size} to {gz_size} bytes")
+
+
+def save_manifest(public_path, manifest, manifest_path, old_outputs, profiler):
+    with profiler.stage("cleanup"):
+        for rel_path in sorted(old_outputs - manifest.outputs()):
+            remove_output(public_path, rel_path)
+
+        manifest.save(manifest_path)
 
-    title = title_nodes[0].children[0].value
-    content_html = doc.to_html()
-    template_html = template_path.read_text()
-    page_html = (
-        template_html.replace("{{ Title }}", title)
-        .replace("{{ Content }}", content_html)
-        .replace('href="/', f'href="{basepath}')
-        .replace('src="/', f'src="{basepath}')
-    )
 
-    dest_path.parent.mkdir(parents=True, exist_ok=True)
-    dest_path.write_text(page_html)
+def build(
+    basepath="/",
+    *,
+    jobs=1,
+    flat=False,
+    link_static=False,
+    block_cache=(DEFAULT_MAX_SIZE, None),
+    gzip=False,
+    swap=False,
+    max_in_flight=None,
+    memory_budget=DEFAULT_MEMORY_BUDGET,
+    search=False,
+    links=False,
+    fingerprint=False,
+    minify=False,
+    shard=None,
+    public_path=None,
+    profiler=NULL_PROFILER,
+):
+    public_path = public_path or PATH_PUBLIC
+    output = staged(public_path) if swap else contextlib.nullcontext(public_path)
+    with output as public_path:
+        manifest_path = public_path / SHARD_MANIFEST if shard else PATH_MANIFEST
+        with profiler.stage("manifest"):
+            old_manifest, old_outputs = load_manifest(manifest_path, public_path)
+            manifest = Manifest(basepath, file_hash(PATH_TEMPLATE), shard=list(shard) if shard else None)
+            rebuild_all = (manifest.basepath, manifest.template, manifest.shard) != (
+                old_manifest.basepath,
+                old_manifest.template,
+                old_manifest.shard,
+            )
 
+        if not shard:
+            copy_static(
+                public_path,
+                manifest,
+                old_manifest,
+                link_static,
+                fingerprint=fingerprint,
+                minify=minify,
+                profiler=profiler,
+            )
+        elif fingerprint:
+            with profiler.stage("static"):
+                manifest.assets = asset_map(static_entries(PATH_STATIC, {}, fingerprint))
+        rebuild_all = rebuild_all or manifest.assets != old_manifest.assets
 
-def build(basepath="/"):
-    if PATH_PUBLIC.exists():
-        shutil.rmtree(PATH_PUBLIC)
+        page_options = {
+            "resolve_url": URLResolver(basepath, manifest.assets),
+            "flat": flat,
+            "block_cache": budget_block_cache(block_cache, memory_budget),
+            "minify": minify,
+            "search": search,
+        }
+        pages = iter_page_jobs(
+            public_path,
+            manifest,
+            old_manifest,
+            rebuild_all=rebuild_all,
+            page_options=page_options,
+            profile=isinstance(profiler, Profiler),
+        )
+        written, changed = generate_pages(
+            profiler.iterate("discover", pages),
+            manifest.pages,
+            jobs,
+            profiler,
+            max_in_flight=max_in_flight,
+            memory_budget=memory_budget,
+        )
+        print(f"Pages: {len(written)} written, {len(manifest.pages) - len(written)} unchanged")
+        if minify:
+            report_minified(manifest)
 
-    shutil.copytree(PATH_STATIC, PATH_PUBLIC)
+        if search and not shard:
+            rebuild = rebuild_all or not old_manifest.search
+            write_search(public_path, manifest, old_manifest, changed, rebuild=rebuild, profiler=profiler)
+        if gzip:
+            compress_site(public_path, manifest, old_manifest, written, jobs=jobs, profiler=profiler)
+        problems = check_site_links(manifest, profiler) if links and not shard else []
+        if problems and swap:
+            raise ValueError("broken links found, output not published", PATH_LINK_REPORT)
+        save_manifest(public_path, manifest, manifest_path, old_outputs, profiler)
 
-    for from_path in PATH_CONTENT.glob("**/*.md"):
-        dest_path = PATH_PUBLIC / from_path.relative_to(PATH_CONTENT).with_suffix(".html")
-        generate_page(from_path, PATH_TEMPLATE, dest_path, basepath)
+    return problems
+
+
+def report_minified(manifest):
+    sizes = [
+        entry["minified"]
+        for entries in (manifest.static, manifest.pages)
+        for entry in entries.values()
+        if "minified" in entry
+    ]
+    raw_size, minified_size = sum(raw for raw, _ in sizes), sum(minified for _, minified in sizes)
+    print(f"Minified {len(sizes)} files: {raw_size} to {minified_size} bytes ({raw_size - minified_size} saved)")
+
+
+def check_site_links(manifest, profiler=NULL_PROFILER):
+    with profiler.stage("links"):
+        checked, problems = check_links(manifest.pages, manifest.static, URLResolver(manifest.basepath))
+        write_report(PATH_LINK_REPORT, checked, problems)
+    print(f"Links: {checked} checked, {len(problems)} broken")
+    for problem in problems:
+        print(f"  {problem['page']}: {problem['reason']} {problem['kind']} {problem['url']}")
+    return problems
+
+
+def merge_shards(
+    shard_paths,
+    *,
+    jobs=1,
+    link=False,
+    gzip=False,
+    search=False,
+    links=False,
+    fingerprint=False,
+    minify=False,
+    profiler=NULL_PROFILER,
+):
+    with profiler.stage("manifest"):
+        shards = load_shards(shard_paths)
+        if search and any(
+            "terms" not in entry["metadata"] for _, shard_manifest in shards for entry in shard_manifest.pages.values()
+        ):
+            raise ValueError("merging a search index needs shards built with --search", shard_paths)
+        old_manifest, old_outputs = load_manifest(PATH_MANIFEST, PATH_PUBLIC)
+        manifest = Manifest(shards[0][1].basepath, shards[0][1].template)
+
+    copy_static(PATH_PUBLIC, manifest, old_manifest, link, fingerprint=fingerprint, minify=minify, profiler=profiler)
+    if manifest.assets != shards[0][1].assets:
+        raise ValueError("shards were built with different static assets", shard_paths[0])
+
+    merged, unchanged = set(), 0
+    with profiler.stage("merge"):
+        for shard_path, shard_manifest in shards:
+            if not gzip:
+                for entry in shard_manifest.pages.values():
+                    entry.pop("gzip", None)
+            manifest.pages.update(shard_manifest.pages)
+            for rel_path in sorted(shard_manifest.outputs()):
+                if same_contents(shard_path / rel_path, PATH_PUBLIC / rel_path):
+                    unchanged += 1
+                else:
+                    copy_file(shard_path / rel_path, PATH_PUBLIC / rel_path, link)
+                    merged.add(str(PATH_PUBLIC / rel_path))
+    print(f"Merged {len(shards)} shards: {len(merged)} outputs copied, {unchanged} unchanged")
+    if minify:
+        report_minified(manifest)
+
+    if search:
+        write_search(PATH_PUBLIC, manifest, old_manifest, set(manifest.pages), rebuild=True, profiler=profiler)
+    if gzip:
+        compress_site(PATH_PUBLIC, manifest, old_manifest, merged, jobs=jobs, profiler=profiler)
+    save_manifest(PATH_PUBLIC, manifest, PATH_MANIFEST, old_outputs, profiler)
+
+    if links:
+        return check_site_links(manifest, profiler)
+    return []
+
+
+def build_pages(page_paths, basepath, options):
+    manifest = Manifest.load(PATH_MANIFEST)
+    if manifest is None or manifest.shard:
+        raise ValueError("single-page builds need the manifest of a full build", PATH_MANIFEST)
+    if basepath != manifest.basepath:
+        raise ValueError("single-page builds must use the basepath of the last full build", manifest.basepath)
+    if not isinstance(page_paths, list) or not all(isinstance(page, str) for page in page_paths):
+        raise ValueError("pages must be a list of content paths", page_paths)
+
+    resolve_url = URLResolver(basepath, manifest.assets)
+    page_options = {
+        "resolve_url": resolve_url,
+        "flat": options["flat"],
+        "block_cache": budget_block_cache(options["block_cache"], options["memory_budget"]),
+        "minify": options["minify"],
+        "search": options["search"],
+    }
+    pages = dict(manifest.pages)
+    written = set()
+    for page in page_paths:
+        from_path = pathlib.Path(page)
+        rel_path = from_path.relative_to(PATH_CONTENT).as_posix()
+        entry = {"output": str(pathlib.PurePosixPath(rel_path).with_suffix(".html"))}
+        entry.update(source_entry(from_path, pages.get(rel_path)))
+        dest_path = PATH_PUBLIC / entry["output"]
+        page_written, page_entry, _ = generate_page_job(
+            (from_path, PATH_TEMPLATE, dest_path, basepath, page_options, False),
+        )
+        entry.update(page_entry)
+        pages[rel_path] = entry
+        if page_written:
+            written.add(str(dest_path))
+        if options["gzip"] and is_compressible(entry["output"]):
+            if page_written or not gzip_path(dest_path).exists():
+                gzip_files([dest_path])
+            entry["gzip"] = gzip_key(entry)
+        else:
+            gzip_path(dest_path).unlink(missing_ok=True)
+
+    if options["search"] and manifest.search:
+        manifest.search, _ = update_search_index(
+            PATH_PUBLIC,
+            pages,
+            manifest.pages,
+            {pathlib.Path(page).relative_to(PATH_CONTENT).as_posix() for page in page_paths},
+            resolve_url=resolve_url,
+            old_files=manifest.search,
+        )
+    manifest.pages = pages
+    manifest.save(PATH_MANIFEST)
+    print(f"Pages: {len(written)} written, {len(page_paths) - len(written)} unchanged")
+
+
+def serve_builds(socket_path, basepath, options):
+    def run(request):
+        request_basepath = request.get("basepath") or basepath
+        if request.get("pages"):
+            build_pages(request["pages"], request_basepath, options)
+        else:
+            build(request_basepath, **options)
+
+    with BuildDaemon(socket_path, run) as daemon:
+        daemon.serve()
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description="Generate the static site from markdown content.")
+    parser.add_argument("basepath", nargs="?", default="/", help="URL prefix for site-absolute links")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes used to generate pages (0 uses every core)",
+    )
+    parser.add_argument(
+        "--flat",
+        action="store_true",
+        help="parse pages into flat array-backed documents instead of node trees",
+    )
+    parser.add_argument(
+        "--link-static",
+        action="store_true",
+        help="hard link static files into the output directory instead of copying them",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="serve the output locally and rebuild changed pages when sources change",
+    )
+    parser.add_argument("--port", type=int, default=8888, help="port of the local server used by --watch")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time each build stage and print per-stage totals and the slowest pages",
+    )
+    parser.add_argument(
+        "--profile-json",
+        type=pathlib.Path,
+        default=PATH_PROFILE,
+        help="where --profile writes the JSON report",
+    )
+    parser.add_argument(
+        "--block-cache-size",
+        type=int,
+        default=DEFAULT_MAX_SIZE >> 20,
+        help="size in MiB of the in-memory cache of rendered blocks, at most 1/16 of --memory-budget (0 disables)",
+    )
+    parser.add_argument(
+        "--block-cache",
+        type=pathlib.Path,
+        help="directory of an on-disk cache of rendered blocks shared across builds",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="write precompressed .gz siblings next to compressible outputs",
+    )
+    parser.add_argument(
+        "--swap",
+        action="store_true",
+        help="build into a staging directory and exchange it with the output in one rename, keeping the previous output",
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="swap the previous output back into place instead of building",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="stay resident after the first build and serve build requests from src/client.py",
+    )
+    parser.add_argument(
+        "--socket",
+        type=pathlib.Path,
+        default=PATH_SOCKET,
+        help="Unix socket used by --daemon",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        help="with --jobs, most pages handed to workers at once (default 8 per job)",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        default=DEFAULT_MEMORY_BUDGET >> 20,
+        help="estimated MiB a build may use: caps the block cache and, with --jobs, the pages in flight (0 disables)",
+    )
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="write a prefix-sharded search index under search/ in the output directory",
+    )
+    parser.add_argument(
+        "--check-links",
+        action="store_true",
+        help=f"check internal links, images and anchors, write a report to {PATH_LINK_REPORT} and fail if any break",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="copy static files to content-hashed names, rewrite references to them and write assets.json",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="collapse insignificant whitespace in pages and minify static CSS, reporting the bytes saved",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        help="only build the pages of shard i/N, into --output (default docs.shard<i>) with its own manifest",
+    )
+    parser.add_argument("--output", type=pathlib.Path, help="output directory of a --shard build")
+    parser.add_argument(
+        "--merge",
+        type=pathlib.Path,
+        nargs="+",
+        metavar="SHARD_DIR",
+        help="combine the outputs of every shard build into the output directory instead of building",
+    )
+    parser.add_argument("--trace", type=pathlib.Path, help="with --profile, also write a Chrome trace-event file")
+    return parser
 
 
 def main():
-    basepath = "/"
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
+    args = make_parser().parse_args()
+
+    if args.rollback:
+        try:
+            rollback(PATH_PUBLIC)
+        except ValueError as exc:
+            print(f"Rollback failed: {exc.args[0]}: {exc.args[1]}")
+            sys.exit(1)
+        PATH_MANIFEST.unlink(missing_ok=True)
+        return
+    if args.merge:
+        if merge_shards(
+            args.merge,
+            jobs=args.jobs or os.cpu_count(),
+            link=args.link_static,
+            gzip=args.gzip,
+            search=args.search,
+            links=args.check_links,
+            fingerprint=args.fingerprint,
+            minify=args.minify,
+        ):
+            sys.exit(1)
+        return
 
-    build(basepath)
+    options = {
+        "jobs": args.jobs or os.cpu_count(),
+        "flat": args.flat,
+        "link_static": args.link_static,
+        "block_cache": (args.block_cache_size << 20, args.block_cache) if args.block_cache_size else None,
+        "gzip": args.gzip,
+        "swap": args.swap,
+        "max_in_flight": args.max_in_flight,
+        "memory_budget": args.memory_budget << 20,
+        "search": args.search,
+        "links": args.check_links,
+        "fingerprint": args.fingerprint,
+        "minify": args.minify,
+    }
+    if args.shard:
+        options["shard"] = args.shard
+        options["public_path"] = args.output or PATH_PUBLIC.with_name(f"{PATH_PUBLIC.name}.shard{args.shard[0]}")
+    watched = [PATH_CONTENT, PATH_STATIC, PATH_TEMPLATE]
+    sources = snapshot(watched) if args.watch else None
+    profiler = Profiler() if args.profile else NULL_PROFILER
+    if args.watch or args.daemon:
+        problems = []
+        try_build(functools.partial(build, args.basepath, profiler=profiler, **options))
+    else:
+        problems = build(args.basepath, profiler=profiler, **options)
+    if args.profile:
+        print(profiler.report())
+        profiler.write_json(args.profile_json)
+        print(f"Profile written to {args.profile_json}")
+        if args.trace:
+            profiler.write_trace(args.trace)
+            print(f"Trace written to {args.trace}")
+    if args.daemon:
+        with contextlib.suppress(KeyboardInterrupt):
+            serve_builds(args.socket, args.basepath, options)
+    elif args.watch:
+        server = serve(PATH_PUBLIC, port=args.port)
+        try:
+            watch(watched, lambda _changed: build(args.basepath, **options), previous=sources)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+    elif problems:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+from fingerprint import ASSET_MANIFEST
+from output import temp_path
+
+MANIFEST_VERSION = 4
+
+
+def file_hash(path):
+    with path.open("rb") as fp:
+        return hashlib.file_digest(fp, "sha256").hexdigest()
+
+
+def source_entry(path, old_entry=None):
+    stat = path.stat()
+    entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if old_entry and (old_entry.get("size"), old_entry.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns):
+        entry["hash"] = old_entry["hash"]
+    else:
+        entry["hash"] = file_hash(path)
+    return entry
+
+
+@dataclass
+class Manifest:
+    basepath: str | None = None
+    template: str | None = None
+    static: dict[str, dict[str, str | int]] = field(default_factory=dict)
+    pages: dict[str, dict[str, str | int]] = field(default_factory=dict)
+    shard: list[int] | None = None
+    search: list[str] = field(default_factory=list)
+    assets: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            data = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if data.pop("version", None) != MANIFEST_VERSION:
+            return None
+        return cls(**data)
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = temp_path(path)
+        try:
+            with tmp_path.open("w") as fp:
+                json.dump({"version": MANIFEST_VERSION, **vars(self)}, fp, indent=1, sort_keys=True)
+            tmp_path.replace(path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def outputs(self):
+        outputs = set(self.search)
+        if self.assets and self.shard is None:
+            outputs.add(ASSET_MANIFEST)
+        for entries in (self.static, self.pages):
+            for entry in entries.values():
+                outputs.add(entry["output"])
+                if "gzip" in entry:
+                    outputs.add(f"{entry['output']}.gz")
+        return outputs
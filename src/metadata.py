@@ -0,0 +1,85 @@
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+
+TERM_RE = re.compile(r"\w\w+")
+SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+SLUG_SPACE_RE = re.compile(r"[\s-]+")
+HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+METADATA_OVERHEAD = 300
+STRING_OVERHEAD = 56
+HEADING_OVERHEAD = 2 * STRING_OVERHEAD + 88
+TERM_OVERHEAD = 72
+
+
+def tokenize(text):
+    return TERM_RE.findall(text.lower())
+
+
+def slugify(text):
+    return SLUG_SPACE_RE.sub("-", SLUG_STRIP_RE.sub("", text.lower())).strip("-")
+
+
+def heading_props(tag, leaves):
+    if tag not in HEADING_TAGS:
+        return None
+    slug = slugify("".join(value for _, value, _ in leaves))
+    return {"id": slug} if slug else None
+
+
+@dataclass(slots=True)
+class PageMetadata:
+    title: str | None = None
+    headings: list[list[int | str]] = field(default_factory=list)
+    links: list[str] = field(default_factory=list)
+    images: list[str] = field(default_factory=list)
+    text_length: int = 0
+    terms: dict[str, int] | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def to_dict(self):
+        data = asdict(self)
+        if self.terms is None:
+            del data["terms"]
+        return data
+
+    def add_block(self, tag, leaves):
+        for leaf_tag, value, props in leaves:
+            match leaf_tag:
+                case "a":
+                    self.links.append(sys.intern(props["href"]))
+                case "img":
+                    self.images.append(sys.intern(props["src"]))
+            self.text_length += len(value)
+            if self.terms is not None and tag != "pre":
+                for term in tokenize(value):
+                    self.terms[term] = self.terms.get(term, 0) + 1
+
+        if tag in HEADING_TAGS:
+            text = "".join(value for _, value, _ in leaves)
+            self.headings.append([int(tag[1]), text, slugify(text)])
+            if tag == "h1" and self.title is None:
+                self.title = leaves[0][1] if leaves else ""
+
+    def extend(self, other):
+        if self.title is None:
+            self.title = other.title
+        self.headings.extend(other.headings)
+        self.links.extend(other.links)
+        self.images.extend(other.images)
+        self.text_length += other.text_length
+        if self.terms is not None and other.terms:
+            for term, count in other.terms.items():
+                self.terms[term] = self.terms.get(term, 0) + count
+
+    def size(self):
+        return (
+            METADATA_OVERHEAD
+            + sum(len(url) + STRING_OVERHEAD for url in self.links)
+            + sum(len(url) + STRING_OVERHEAD for url in self.images)
+            + sum(2 * len(heading[1]) + HEADING_OVERHEAD for heading in self.headings)
+            + sum(len(term) + TERM_OVERHEAD for term in self.terms or ())
+        )
@@ -0,0 +1,99 @@
+import re
+
+TOKEN_RE = re.compile(r"<[^>]*>?|\s+|[^<\s]+")
+TAG_NAME_RE = re.compile(r"</?([a-zA-Z][a-zA-Z0-9]*)")
+CSS_TOKEN_RE = re.compile(
+    r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/|\s*;\s*(?=\})|\s*([{};,>])\s*|(:)\s+|\s+""",
+    re.DOTALL,
+)
+
+RAW_TAGS = frozenset({"pre", "textarea", "script", "style"})
+BLOCK_TAGS = frozenset(
+    {
+        *("html", "head", "body", "title", "meta", "link", "base", "script", "style"),
+        *("article", "aside", "blockquote", "div", "footer", "header", "main", "nav", "p", "pre", "section"),
+        *("h1", "h2", "h3", "h4", "h5", "h6", "hr", "li", "ol", "ul"),
+        *("table", "tbody", "td", "tfoot", "th", "thead", "tr"),
+    },
+)
+MINIFIED_SUFFIXES = frozenset({".css"})
+
+
+def is_minifiable(path):
+    return path.suffix in MINIFIED_SUFFIXES
+
+
+class HTMLMinifier:
+    def __init__(self):
+        self.input_size = 0
+        self.output_size = 0
+        self._raw = None
+        self._space = False
+        self._after_block = True
+        self._partial = ""
+
+    def __repr__(self):
+        return f"HTMLMinifier(input_size={self.input_size}, output_size={self.output_size})"
+
+    def feed(self, chunk):
+        self.input_size += len(chunk.encode())
+        text = self._partial + chunk
+        self._partial = ""
+        out = []
+        for match in TOKEN_RE.finditer(text):
+            token = match[0]
+            if token[0] == "<" and token[-1] != ">":
+                self._partial = token
+                break
+            if token[0] == "<":
+                tag = TAG_NAME_RE.match(token)
+                name = tag[1].lower() if tag else ""
+                closing = token.startswith("</")
+                if self._raw:
+                    out.append(token)
+                    if closing and name == self._raw:
+                        self._raw = None
+                        self._after_block = name in BLOCK_TAGS
+                    continue
+                block = name in BLOCK_TAGS or token.startswith("<!")
+                if self._space and not (block or self._after_block):
+                    out.append(" ")
+                out.append(token)
+                self._space = False
+                self._after_block = block
+                if not closing and name in RAW_TAGS:
+                    self._raw = name
+            elif self._raw:
+                out.append(token)
+            elif token.isspace():
+                self._space = True
+            else:
+                if self._space and not self._after_block:
+                    out.append(" ")
+                out.append(token)
+                self._space = False
+                self._after_block = False
+        html = "".join(out)
+        self.output_size += len(html.encode())
+        return html
+
+    def close(self):
+        html, self._partial = self._partial, ""
+        self.output_size += len(html.encode())
+        return html
+
+    def iter_minify(self, chunks):
+        for chunk in chunks:
+            html = self.feed(chunk)
+            if html:
+                yield html
+        html = self.close()
+        if html:
+            yield html
+
+
+def minify_css(text):
+    def replace(match):
+        return match[1] or match[2] or match[3] or (" " if match[0].isspace() else "")
+
+    return CSS_TOKEN_RE.sub(replace, text).strip()
@@ -0,0 +1,31 @@
+import filecmp
+import os
+
+
+def temp_path(path):
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def same_contents(path, other_path):
+    try:
+        if path.stat().st_size != other_path.stat().st_size:
+            return False
+    except FileNotFoundError:
+        return False
+    return filecmp.cmp(path, other_path, shallow=False)
+
+
+def write_if_changed(dest_path, chunks):
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = temp_path(dest_path)
+    try:
+        with tmp_path.open("w") as out:
+            out.writelines(chunks)
+        if same_contents(tmp_path, dest_path):
+            tmp_path.unlink()
+            return False
+        tmp_path.replace(dest_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
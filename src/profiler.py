@@ -0,0 +1,153 @@
+import contextlib
+import json
+import os
+import time
+from collections import defaultdict
+
+PAGE_STAGES = (
+    "read",
+    "parse_blocks",
+    "parse_inline",
+    "parse",
+    "render_blocks",
+    "serialize",
+    "template",
+    "minify",
+    "write",
+)
+
+
+class NullProfiler:
+    def page(self, _name):
+        return contextlib.nullcontext()
+
+    def stage(self, _name):
+        return contextlib.nullcontext()
+
+    def iterate(self, _name, iterable):
+        return iterable
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class Profiler:
+    def __init__(self):
+        self.pages = []
+        self.build_stages = defaultdict(int)
+        self.start_ns = time.perf_counter_ns()
+        self._page = None
+        self._stack = []
+
+    def _add(self, name, elapsed):
+        stages = self._page["stages"] if self._page else self.build_stages
+        stages[name] = stages.get(name, 0) + elapsed
+
+    def _enter(self, name):
+        now = time.perf_counter_ns()
+        if self._stack:
+            self._add(self._stack[-1][0], now - self._stack[-1][1])
+        self._stack.append([name, now])
+
+    def _exit(self):
+        now = time.perf_counter_ns()
+        name, start = self._stack.pop()
+        self._add(name, now - start)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    @contextlib.contextmanager
+    def page(self, name):
+        self._page = {"page": str(name), "pid": os.getpid(), "start_ns": time.perf_counter_ns(), "stages": {}}
+        try:
+            yield
+        finally:
+            self._page["end_ns"] = time.perf_counter_ns()
+            self.pages.append(self._page)
+            self._page = None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def iterate(self, name, iterable):
+        iterator = iter(iterable)
+        while True:
+            self._enter(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit()
+            yield item
+
+    def merge(self, pages):
+        self.pages.extend(pages)
+
+    def totals(self):
+        totals = defaultdict(int, self.build_stages)
+        for page in self.pages:
+            for name, elapsed in page["stages"].items():
+                totals[name] += elapsed
+        return dict(totals)
+
+    def slowest(self, count=10):
+        return sorted(self.pages, key=lambda page: page["end_ns"] - page["start_ns"], reverse=True)[:count]
+
+    def to_json(self, count=10):
+        return {
+            "wall_ns": time.perf_counter_ns() - self.start_ns,
+            "totals_ns": self.totals(),
+            "build_stages_ns": dict(self.build_stages),
+            "slowest": [page["page"] for page in self.slowest(count)],
+            "pages": self.pages,
+        }
+
+    def report(self, count=10):
+        totals = self.totals()
+        overall = sum(totals.values()) or 1
+        lines = [f"{'stage':<16} {'ms':>10} {'%':>6}"]
+        for name, elapsed in sorted(totals.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"{name:<16} {elapsed / 1e6:>10.2f} {100 * elapsed / overall:>6.1f}")
+        lines.append(f"{'total':<16} {overall / 1e6:>10.2f} {100:>6.1f}")
+
+        stages = [name for name in PAGE_STAGES if any(name in page["stages"] for page in self.pages)]
+        if stages:
+            lines.extend(("", f"slowest pages ({len(self.pages)} generated)"))
+            lines.append(f"{'ms':>10} " + " ".join(f"{name:>12}" for name in stages) + "  page")
+            for page in self.slowest(count):
+                cells = " ".join(f"{page['stages'].get(name, 0) / 1e6:>12.2f}" for name in stages)
+                lines.append(f"{(page['end_ns'] - page['start_ns']) / 1e6:>10.2f} {cells}  {page['page']}")
+        return "\n".join(lines)
+
+    def trace_events(self):
+        events = []
+        for page in self.pages:
+            common = {"pid": page["pid"], "tid": page["pid"], "cat": "page"}
+            start_us = (page["start_ns"] - self.start_ns) / 1e3
+            events.append(
+                {
+                    **common,
+                    "name": page["page"],
+                    "ph": "X",
+                    "ts": start_us,
+                    "dur": (page["end_ns"] - page["start_ns"]) / 1e3,
+                },
+            )
+            for name, elapsed in page["stages"].items():
+                events.append({**common, "name": name, "ph": "X", "ts": start_us, "dur": elapsed / 1e3})
+                start_us += elapsed / 1e3
+        return events
+
+    def write_trace(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}))
+
+    def write_json(self, path, count=10):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_json(count), indent=1))
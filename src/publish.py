@@ -0,0 +1,75 @@
+import contextlib
+import ctypes
+import os
+import shutil
+
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+
+def staging_path(public_path):
+    return public_path.with_name(f"{public_path.name}.staging")
+
+
+def previous_path(public_path):
+    return public_path.with_name(f"{public_path.name}.previous")
+
+
+def link_tree(from_path, dest_path):
+    if dest_path.exists():
+        shutil.rmtree(dest_path)
+    if from_path.exists():
+        shutil.copytree(from_path, dest_path, symlinks=True, copy_function=os.link)
+    else:
+        dest_path.mkdir(parents=True)
+
+
+def exchange(path, other_path):
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (AttributeError, OSError):
+        return False
+    result = renameat2(AT_FDCWD, os.fsencode(path), AT_FDCWD, os.fsencode(other_path), RENAME_EXCHANGE)
+    return result == 0
+
+
+def swap(new_path, public_path):
+    previous = previous_path(public_path)
+    if previous.exists():
+        shutil.rmtree(previous)
+    if not public_path.exists():
+        new_path.rename(public_path)
+    elif exchange(new_path, public_path):
+        new_path.rename(previous)
+    else:
+        public_path.rename(previous)
+        new_path.rename(public_path)
+
+
+@contextlib.contextmanager
+def staged(public_path):
+    staging = staging_path(public_path)
+    link_tree(public_path, staging)
+    try:
+        yield staging
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    swap(staging, public_path)
+    print(f"Published {public_path}, previous output kept in {previous_path(public_path)}")
+
+
+def rollback(public_path):
+    previous = previous_path(public_path)
+    if not public_path.is_dir():
+        raise ValueError("no published output to roll back", public_path)
+    if not previous.is_dir():
+        raise ValueError("no previous output to roll back to", previous)
+    if not exchange(previous, public_path):
+        current = staging_path(public_path)
+        if current.exists():
+            shutil.rmtree(current)
+        public_path.rename(current)
+        previous.rename(public_path)
+        current.rename(previous)
+    print(f"Rolled back {public_path}, replaced output kept in {previous}")
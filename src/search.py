@@ -0,0 +1,86 @@
+import itertools
+import json
+from collections import defaultdict
+
+from output import write_if_changed
+
+SEARCH_DIR = "search"
+SEARCH_PAGES = f"{SEARCH_DIR}/pages.json"
+PREFIX_LENGTH = 2
+
+
+def shard_output(prefix):
+    return f"{SEARCH_DIR}/{prefix}.json"
+
+
+def dump(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+def assign_ids(pages, old_pages, rebuild=False):
+    ids = {}
+    if not rebuild:
+        ids = {rel_path: entry["search_id"] for rel_path, entry in old_pages.items() if "search_id" in entry}
+    live = {rel_path: ids[rel_path] for rel_path in pages if rel_path in ids}
+    used = set(live.values())
+    free = (page_id for page_id in itertools.count() if page_id not in used)
+    for rel_path in sorted(pages):
+        if rel_path not in live:
+            live[rel_path] = next(free)
+        pages[rel_path]["search_id"] = live[rel_path]
+    return live
+
+
+def load_shard(path):
+    try:
+        data = json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    return {term: dict(postings) for term, postings in data.items()}
+
+
+def update_search_index(public_path, pages, old_pages, changed, *, resolve_url, old_files=(), rebuild=False):
+    ids = assign_ids(pages, old_pages, rebuild)
+    if not rebuild and 2 * len(ids) < max(ids.values(), default=-1) + 1:
+        rebuild = True
+        ids = assign_ids(pages, old_pages, rebuild)
+    old_ids = (
+        {}
+        if rebuild
+        else {rel_path: entry["search_id"] for rel_path, entry in old_pages.items() if "search_id" in entry}
+    )
+    changed = set(pages) if rebuild else {*changed, *(rel_path for rel_path in ids if rel_path not in old_ids)}
+    removed = set(old_ids) - set(pages)
+
+    updates = defaultdict(lambda: defaultdict(dict))
+    for rel_path in sorted(removed | (changed & set(old_ids))):
+        for term in old_pages[rel_path]["metadata"]["terms"]:
+            updates[term[:PREFIX_LENGTH]][term][old_ids[rel_path]] = 0
+    for rel_path in sorted(changed):
+        for term, count in pages[rel_path]["metadata"]["terms"].items():
+            updates[term[:PREFIX_LENGTH]][term][ids[rel_path]] = count
+
+    files = set() if rebuild else set(old_files)
+    written = 0
+    for prefix, terms in sorted(updates.items()):
+        rel_path = shard_output(prefix)
+        shard = {} if rebuild else load_shard(public_path / rel_path)
+        for term, postings in terms.items():
+            merged = {**shard.get(term, {}), **postings}
+            shard[term] = {page_id: count for page_id, count in merged.items() if count}
+            if not shard[term]:
+                del shard[term]
+        if not shard:
+            files.discard(rel_path)
+            continue
+        files.add(rel_path)
+        data = {term: sorted(postings.items()) for term, postings in shard.items()}
+        written += write_if_changed(public_path / rel_path, [dump(data)])
+
+    by_id = [None] * (max(ids.values(), default=-1) + 1)
+    for rel_path, page_id in ids.items():
+        entry = pages[rel_path]
+        by_id[page_id] = [resolve_url(f"/{entry['output']}").removesuffix("index.html"), entry["metadata"]["title"]]
+    written += write_if_changed(public_path / SEARCH_PAGES, [dump(by_id)])
+    files.add(SEARCH_PAGES)
+    return sorted(files), written
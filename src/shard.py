@@ -0,0 +1,39 @@
+import hashlib
+from pathlib import PurePosixPath
+
+from manifest import Manifest
+
+SHARD_MANIFEST = ".shard-manifest.json"
+
+
+def parse_shard(text):
+    index, sep, count = text.partition("/")
+    if not sep or not index.isdigit() or not count.isdigit() or not 0 <= int(index) < int(count):
+        raise ValueError("shard must look like i/N with 0 <= i < N", text)
+    return int(index), int(count)
+
+
+def shard_of(rel_path, count):
+    digest = hashlib.sha256(PurePosixPath(rel_path).as_posix().encode()).digest()
+    return int.from_bytes(digest[:8]) % count
+
+
+def load_shards(shard_paths):
+    shards = []
+    for shard_path in shard_paths:
+        shard_manifest = Manifest.load(shard_path / SHARD_MANIFEST)
+        if shard_manifest is None or shard_manifest.shard is None:
+            raise ValueError("missing shard manifest", shard_path / SHARD_MANIFEST)
+        shards.append((shard_path, shard_manifest))
+
+    first = shards[0][1]
+    for shard_path, shard_manifest in shards:
+        if (shard_manifest.basepath, shard_manifest.template) != (first.basepath, first.template):
+            raise ValueError("shard was built with a different basepath or template", shard_path)
+        if shard_manifest.assets != first.assets:
+            raise ValueError("shard was built with different static assets", shard_path)
+    counts = {shard_manifest.shard[1] for _, shard_manifest in shards}
+    indexes = sorted(shard_manifest.shard[0] for _, shard_manifest in shards)
+    if len(counts) != 1 or indexes != list(range(counts.pop())):
+        raise ValueError("shards do not cover the site exactly once", indexes)
+    return shards
@@ -0,0 +1,107 @@
+import os
+import shutil
+
+from fingerprint import fingerprint_name, is_fingerprinted
+from manifest import source_entry
+from minify import is_minifiable, minify_css
+from output import same_contents, temp_path, write_if_changed
+
+COPY_CHUNK_SIZE = 1 << 30
+
+
+def copy_file_range(from_path, dest_path):
+    with from_path.open("rb") as src, dest_path.open("wb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), min(remaining, COPY_CHUNK_SIZE))
+            if copied == 0:
+                break
+            remaining -= copied
+    shutil.copystat(from_path, dest_path)
+
+
+def copy_to(from_path, tmp_path, link=False):
+    if link:
+        try:
+            os.link(from_path, tmp_path)
+        except OSError:
+            pass
+        else:
+            return "link"
+
+    if hasattr(os, "copy_file_range"):
+        try:
+            copy_file_range(from_path, tmp_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+        else:
+            return "copy_file_range"
+
+    shutil.copy2(from_path, tmp_path)
+    return "copy"
+
+
+def copy_file(from_path, dest_path, link=False):
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    # replacing never writes through an existing hard link into the source file
+    tmp_path = temp_path(dest_path)
+    try:
+        method = copy_to(from_path, tmp_path, link)
+        tmp_path.replace(dest_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return method
+
+
+def output_matches(dest_path, size):
+    try:
+        return dest_path.stat().st_size == size
+    except FileNotFoundError:
+        return False
+
+
+def static_entries(static_path, old_entries, fingerprint=False):
+    entries = {}
+    for from_path in sorted(path for path in static_path.glob("**/*") if path.is_file()):
+        rel_path = from_path.relative_to(static_path).as_posix()
+        entry = source_entry(from_path, old_entries.get(rel_path))
+        output = fingerprint_name(rel_path, entry["hash"]) if fingerprint and is_fingerprinted(rel_path) else rel_path
+        entries[rel_path] = {"output": output, **entry}
+    return entries
+
+
+def minify_file(from_path, dest_path):
+    css = minify_css(from_path.read_text())
+    write_if_changed(dest_path, [css])
+    return dest_path.stat().st_size
+
+
+def sync_static(static_path, public_path, old_entries, link=False, *, fingerprint=False, minify=False):
+    entries = static_entries(static_path, old_entries, fingerprint)
+    copied = 0
+    for rel_path, entry in entries.items():
+        from_path = static_path / rel_path
+        dest_path = public_path / entry["output"]
+        old_entry = old_entries.get(rel_path)
+        minified = minify and is_minifiable(from_path)
+        if (
+            old_entry
+            and (old_entry.get("output"), old_entry.get("hash")) == (entry["output"], entry["hash"])
+            and ("minified" in old_entry) == minified
+            and output_matches(dest_path, old_entry["minified"][1] if minified else entry["size"])
+        ):
+            if minified:
+                entry["minified"] = old_entry["minified"]
+            continue
+        if not old_entry and not minified and same_contents(from_path, dest_path):
+            continue
+
+        if minified:
+            entry["minified"] = [entry["size"], minify_file(from_path, dest_path)]
+            print(f"Minifying static file {from_path} to {dest_path}")
+        else:
+            method = copy_file(from_path, dest_path, link)
+            print(f"Copying static file {from_path} to {dest_path} ({method})")
+        copied += 1
+    return entries, copied
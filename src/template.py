@@ -0,0 +1,40 @@
+import re
+
+TEMPLATE_SLOT_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+_TEMPLATE_CACHE = {}
+
+
+class Template:
+    def __init__(self, text, resolve_url=None):
+        parts = TEMPLATE_SLOT_RE.split(text)
+        self.literals = parts[0::2] if resolve_url is None else [resolve_url.rewrite_html(part) for part in parts[0::2]]
+        self.slots = parts[1::2]
+
+    def __repr__(self):
+        return f"Template(slots={self.slots})"
+
+    @classmethod
+    def load(cls, path, resolve_url=None):
+        mtime = path.stat().st_mtime_ns
+        key = (path, resolve_url)
+        cached = _TEMPLATE_CACHE.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, cls(path.read_text(), resolve_url))
+            _TEMPLATE_CACHE[key] = cached
+        return cached[1]
+
+    def iter_render(self, **values):
+        for literal, slot in zip(self.literals, self.slots, strict=False):
+            yield literal
+            if slot not in values:
+                raise ValueError("missing template value", slot)
+            value = values[slot]
+            if isinstance(value, str):
+                yield value
+            else:
+                yield from value
+        yield self.literals[-1]
+
+    def render(self, **values):
+        return "".join(self.iter_render(**values))
@@ -0,0 +1,68 @@
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from bench.corpus import CorpusSpec, iter_pages, write_corpus
+from bench.inline import legacy_from_text, link_paragraph
+from bench.memory import check_memory, run_memory
+from bench.results import compare_results, make_results
+from blocknode import BlockNode
+from textnode import TextNode
+
+
+class TestBench(unittest.TestCase):
+    spec = CorpusSpec(pages=5, link_density=0.2, image_density=0.1)
+
+    def test_corpus_deterministic(self):
+        self.assertListEqual(list(iter_pages(self.spec)), list(iter_pages(self.spec)))
+        self.assertNotEqual(list(iter_pages(self.spec)), list(iter_pages(CorpusSpec(pages=5, seed=1))))
+
+    def test_corpus_parses(self):
+        for _, markdown in iter_pages(self.spec):
+            html = BlockNode.from_document(markdown).to_html()
+            self.assertIn("<h1 id=", html)
+            self.assertIn("<a href=", html)
+            self.assertIn("<pre><code>", html)
+
+    def test_write_corpus(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = write_corpus(pathlib.Path(tmpdir), self.spec)
+            self.assertEqual(len(list((root / "content").glob("**/*.md"))), 5)
+            self.assertEqual(len(list((root / "static" / "images").iterdir())), self.spec.images)
+            self.assertTrue((root / "template.html").exists())
+
+    def test_memory(self):
+        with mock.patch("builtins.print"):
+            results = run_memory(CorpusSpec(sections=1, list_items=0), [2, 4], jobs=2)
+        self.assertListEqual(sorted(results), [2, 4])
+        for result in results.values():
+            self.assertGreater(result["peak_rss_kb"], 0)
+
+    def test_legacy_inline(self):
+        text = link_paragraph(3)
+        self.assertListEqual(legacy_from_text(text), TextNode.from_text(text))
+
+    def test_check_memory(self):
+        results = {
+            1000: {"peak_rss_kb": 40000, "peak_worker_rss_kb": 0},
+            10000: {"peak_rss_kb": 70000, "peak_worker_rss_kb": 0},
+        }
+        self.assertListEqual(check_memory(results), [])
+        results[10000]["peak_rss_kb"] = 80000
+        self.assertEqual(check_memory(results)[0][0], "peak_rss_kb")
+        results[10000]["peak_rss_kb"] = 400000
+        self.assertListEqual(check_memory(results), [("peak_rss_kb", 40.0)])
+
+    def test_compare_results(self):
+        baseline = make_results(self.spec, {"render": {"seconds": 1.0, "peak_bytes": 100}})
+        current = make_results(self.spec, {"render": {"seconds": 1.1, "peak_bytes": 200}})
+        self.assertListEqual(compare_results(baseline, current), [("render", "peak_bytes", 100, 200, 2.0)])
+        self.assertListEqual(compare_results(baseline, baseline), [])
+
+        with self.assertRaises(ValueError):
+            compare_results(baseline, make_results(CorpusSpec(), current["stages"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
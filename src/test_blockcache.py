@@ -0,0 +1,66 @@
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from blockcache import ENTRY_OVERHEAD, BlockCache
+from blocknode import BlockNode
+from metadata import METADATA_OVERHEAD, PageMetadata
+
+
+class TestBlockCache(unittest.TestCase):
+    block = BlockNode.from_text("This is **bold** text")
+    block2 = BlockNode.from_text("- a list\n- of items")
+
+    def test_render(self):
+        cache = BlockCache()
+        self.assertEqual(cache.render(self.block), "<p>This is <b>bold</b> text</p>")
+        with mock.patch.object(BlockNode, "to_parent") as to_parent:
+            self.assertEqual(cache.render(self.block), "<p>This is <b>bold</b> text</p>")
+            to_parent.assert_not_called()
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_key(self):
+        self.assertEqual(BlockCache.key(self.block), BlockCache.key(BlockNode.from_text("This is **bold** text")))
+        self.assertNotEqual(BlockCache.key(self.block), BlockCache.key(self.block2))
+
+    def test_lru(self):
+        cache = BlockCache(max_size=ENTRY_OVERHEAD + METADATA_OVERHEAD + 60)
+        html = cache.render(self.block)
+        cache.render(self.block2)
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.get(BlockCache.key(self.block)))
+        self.assertLessEqual(cache.size, ENTRY_OVERHEAD + METADATA_OVERHEAD + 60)
+
+        cache.put("a", ("x" * 61, PageMetadata()))
+        self.assertIsNone(cache.get("a"))
+        self.assertNotEqual(html, cache.get(BlockCache.key(self.block2))[0])
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir)
+            BlockCache(path=path).render(self.block)
+            cache = BlockCache(path=path)
+            with mock.patch.object(BlockNode, "to_parent") as to_parent:
+                self.assertEqual(cache.render(self.block), "<p>This is <b>bold</b> text</p>")
+                to_parent.assert_not_called()
+            self.assertEqual(cache.disk_hits, 1)
+
+    def test_metadata(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir)
+            block = BlockNode.from_text("- [a](/a)\n- ![b](/b.png)")
+            for cache in (BlockCache(path=path), BlockCache(path=path), BlockCache(path=path)):
+                metadata = PageMetadata()
+                cache.render(block, metadata=metadata)
+                cache.render(block, metadata=metadata)
+                self.assertListEqual(metadata.links, ["/a", "/a"])
+                self.assertListEqual(metadata.images, ["/b.png", "/b.png"])
+
+    def test_shared(self):
+        self.assertIs(BlockCache.shared(100), BlockCache.shared(100))
+        self.assertIsNot(BlockCache.shared(100), BlockCache.shared(200))
+
+
+if __name__ == "__main__":
+    unittest.main()
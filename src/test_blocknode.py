@@ -1,7 +1,9 @@
+import io
 import unittest
 
 from blocknode import BlockNode, BlockType
 from htmlnode import LeafNode, ParentNode
+from urls import URLResolver
 
 
 class TestBlockNode(unittest.TestCase):
@@ -102,12 +104,36 @@ This is the same paragraph on a new line
             ],
         )
 
+    def test_iter_blocks(self):
+        fp = io.StringIO(
+            "  # This is a heading  \n\n\n\n"
+            "> a quote\n> on two lines\n"
+            "   \n\n"
+            "1. first\n2. second\n\n"
+            "1. first\n3. third\n",
+        )
+        blocks = BlockNode.iter_blocks(fp)
+        self.assertEqual(next(blocks), BlockNode("# This is a heading", BlockType.HEADING))
+        self.assertEqual(next(blocks), BlockNode("> a quote\n> on two lines", BlockType.QUOTE))
+        self.assertListEqual(
+            list(blocks),
+            [
+                BlockNode("1. first\n2. second", BlockType.ORDERED_LIST),
+                BlockNode("1. first\n3. third", BlockType.PARAGRAPH),
+            ],
+        )
+
+    def test_document_from_lines(self):
+        md = "# Title\n\nSome **bold** text\nacross lines\n\n- one\n- two\n"
+        self.assertEqual(BlockNode.from_document(io.StringIO(md)), BlockNode.from_document(md))
+
     def test_parent_heading(self):
         parent = BlockNode.from_text(self.node1_text).to_parent()
         self.assertIsInstance(parent, ParentNode)
         self.assertEqual(parent.tag, "h1")
         self.assertListEqual(parent.children, [LeafNode(None, "This is a heading")])
-        self.assertIsNone(parent.props)
+        self.assertDictEqual(parent.props, {"id": "this-is-a-heading"})
+        self.assertIsNone(BlockNode.from_text("## ?!").to_parent().props)
 
     def test_parent_code(self):
         parent = BlockNode.from_text(self.node2_text).to_parent()
@@ -206,6 +232,15 @@ the **same** even with inline stuff
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff</code></pre></div>",
         )
 
+    def test_document_resolve_url(self):
+        md = '[home](/) and ![logo](/logo.png)\n\n```\n<a href="/raw">\n```'
+        html = BlockNode.from_document(md, URLResolver("/site/")).to_html()
+        self.assertEqual(
+            html,
+            '<div><p><a href="/site/">home</a> and <img alt="logo" src="/site/logo.png"></img></p>'
+            '<pre><code><a href="/raw"></code></pre></div>',
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,484 @@
+import gzip
+import json
+import pathlib
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import main
+from client import send_request
+from profiler import Profiler
+
+TEMPLATE = '<html><head><title>{{ Title }}</title><link href="/index.css"></head><body>{{ Content }}</body></html>'
+
+
+class TestBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = pathlib.Path(self.tmpdir.name)
+        (self.root / "content" / "blog").mkdir(parents=True)
+        (self.root / "static" / "images").mkdir(parents=True)
+        (self.root / "template.html").write_text(TEMPLATE)
+        (self.root / "content" / "index.md").write_text("# Home\n\n[Post](/blog/post)")
+        (self.root / "content" / "blog" / "post.md").write_text("# Post\n\nSome **text**.")
+        (self.root / "static" / "index.css").write_text("body { margin: 0; }")
+        (self.root / "static" / "images" / "logo.png").write_bytes(b"\x89PNG")
+
+        patches = {
+            "PATH_TEMPLATE": self.root / "template.html",
+            "PATH_CONTENT": self.root / "content",
+            "PATH_STATIC": self.root / "static",
+            "PATH_PUBLIC": self.root / "docs",
+            "PATH_MANIFEST": self.root / ".cache" / "manifest.json",
+        }
+        for name, value in patches.items():
+            patcher = mock.patch.object(main, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        patcher = mock.patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def build(self, basepath="/", **options):
+        with mock.patch.object(main, "generate_page", wraps=main.generate_page) as generate_page:
+            main.build(basepath, **options)
+        return sorted(
+            call.args[0].relative_to(self.root / "content").as_posix() for call in generate_page.call_args_list
+        )
+
+    def outputs(self):
+        public = self.root / "docs"
+        return sorted(path.relative_to(public).as_posix() for path in public.glob("**/*") if path.is_file())
+
+    def test_full_build(self):
+        self.assertListEqual(self.build(), ["blog/post.md", "index.md"])
+        self.assertListEqual(self.outputs(), ["blog/post.html", "images/logo.png", "index.css", "index.html"])
+        self.assertIn("<b>text</b>", (self.root / "docs" / "blog" / "post.html").read_text())
+
+    def test_unchanged(self):
+        self.build()
+        self.assertListEqual(self.build(), [])
+
+    def test_metadata(self):
+        self.build()
+        pages = json.loads((self.root / ".cache" / "manifest.json").read_text())["pages"]
+        self.assertEqual(pages["index.md"]["metadata"]["title"], "Home")
+        self.assertListEqual(pages["index.md"]["metadata"]["links"], ["/blog/post"])
+        self.assertListEqual(pages["blog/post.md"]["metadata"]["headings"], [[1, "Post", "post"]])
+
+        (self.root / "content" / "blog" / "post.md").write_text("# Post\n\n## Part\n\nOther _text_.")
+        main.build(jobs=2)
+        pages = json.loads((self.root / ".cache" / "manifest.json").read_text())["pages"]
+        self.assertEqual(pages["index.md"]["metadata"]["title"], "Home")
+        self.assertListEqual(pages["blog/post.md"]["metadata"]["headings"], [[1, "Post", "post"], [2, "Part", "part"]])
+
+    def test_search(self):
+        self.build(search=True)
+        self.assertIn("search/pages.json", self.outputs())
+        self.assertIn("search/te.json", self.outputs())
+        self.assertDictEqual(json.loads((self.root / "docs" / "search" / "te.json").read_text()), {"text": [[0, 1]]})
+
+        (self.root / "content" / "blog" / "post.md").write_text("# Post\n\nOther words.")
+        self.build(search=True)
+        self.assertNotIn("search/te.json", self.outputs())
+        self.assertIn("search/wo.json", self.outputs())
+
+        self.build()
+        self.assertFalse(any(path.startswith("search/") for path in self.outputs()))
+        pages = json.loads((self.root / ".cache" / "manifest.json").read_text())["pages"]
+        self.assertNotIn("terms", pages["index.md"]["metadata"])
+        self.assertListEqual(self.build(search=True), ["blog/post.md", "index.md"])
+        self.assertIn("search/wo.json", self.outputs())
+
+    def test_check_links(self):
+        report_path = self.root / ".cache" / "linkcheck.json"
+        with mock.patch.object(main, "PATH_LINK_REPORT", report_path):
+            self.assertListEqual(main.build(links=True), [])
+            self.assertDictEqual(json.loads(report_path.read_text()), {"checked": 1, "broken": []})
+
+            (self.root / "content" / "index.md").write_text("# Home\n\n[Post](/blog/post#part) ![Logo](/logo.png)")
+            problems = main.build("/site/", links=True)
+            self.assertListEqual(
+                problems,
+                [
+                    {"page": "index.md", "kind": "link", "url": "/site/blog/post#part", "reason": "anchor"},
+                    {"page": "index.md", "kind": "image", "url": "/site/logo.png", "reason": "missing"},
+                ],
+            )
+            self.assertEqual(json.loads(report_path.read_text())["broken"], problems)
+
+            (self.root / "content" / "index.md").write_text("# Home\n\n[Post](/blog/post#part)")
+            (self.root / "content" / "blog" / "post.md").write_text("# Post\n\n## Part\n\nSome text.")
+            for options in ({}, {"flat": True}, {"block_cache": None}):
+                with self.subTest(**options):
+                    self.assertListEqual(main.build("/site/", links=True, **options), [])
+                    html = (self.root / "docs" / "blog" / "post.html").read_text()
+                    self.assertIn('<h2 id="part">Part</h2>', html)
+                    (self.root / ".cache" / "manifest.json").unlink()
+
+            (self.root / "content" / "index.md").write_text("# Home\n\n[Missing](/missing)")
+            with self.assertRaises(ValueError):
+                main.build("/site/", links=True, swap=True)
+            self.assertFalse((self.root / "docs.staging").exists())
+            self.assertIn("/blog/post#part", (self.root / "docs" / "index.html").read_text())
+            self.assertFalse((self.root / ".cache" / "manifest.json").exists())
+
+    def test_fingerprint(self):
+        (self.root / "content" / "index.md").write_text("# Home\n\n![Logo](/images/logo.png)")
+        self.build(fingerprint=True)
+        assets = json.loads((self.root / "docs" / "assets.json").read_text())
+        self.assertListEqual(sorted(assets), ["images/logo.png", "index.css"])
+        self.assertRegex(assets["index.css"], r"^index\.[0-9a-f]{10}\.css$")
+        self.assertListEqual(
+            self.outputs(),
+            sorted(["assets.json", "blog/post.html", "index.html", *assets.values()]),
+        )
+        html = (self.root / "docs" / "index.html").read_text()
+        self.assertIn(f'<link href="/{assets["index.css"]}">', html)
+        self.assertIn(f'src="/{assets["images/logo.png"]}"', html)
+        self.assertListEqual(self.build(fingerprint=True), [])
+
+        (self.root / "static" / "index.css").write_text("body { margin: 1; }")
+        self.assertListEqual(self.build(fingerprint=True), ["blog/post.md", "index.md"])
+        new_assets = json.loads((self.root / "docs" / "assets.json").read_text())
+        self.assertNotEqual(new_assets["index.css"], assets["index.css"])
+        self.assertNotIn(assets["index.css"], self.outputs())
+
+        self.build()
+        self.assertListEqual(self.outputs(), ["blog/post.html", "images/logo.png", "index.css", "index.html"])
+        self.assertIn('<link href="/index.css">', (self.root / "docs" / "index.html").read_text())
+
+    def test_minify(self):
+        (self.root / "template.html").write_text(TEMPLATE.replace("><", ">\n  <"))
+        (self.root / "content" / "blog" / "post.md").write_text("# Post\n\n```\ndef f():\n    pass\n```")
+        self.build(minify=True)
+        html = (self.root / "docs" / "blog" / "post.html").read_text()
+        self.assertEqual(
+            html,
+            '<html><head><title>Post</title><link href="/index.css"></head>'
+            '<body><div><h1 id="post">Post</h1><pre><code>def f():\n    pass</code></pre></div></body></html>',
+        )
+        self.assertEqual((self.root / "docs" / "index.css").read_text(), "body{margin:0}")
+        pages = json.loads((self.root / ".cache" / "manifest.json").read_text())["pages"]
+        self.assertEqual(pages["blog/post.md"]["minified"][1], len(html))
+        self.assertListEqual(self.build(minify=True), [])
+
+        self.assertListEqual(self.build(), ["blog/post.md", "index.md"])
+        self.assertIn("<html>\n  <head>", (self.root / "docs" / "blog" / "post.html").read_text())
+        self.assertEqual((self.root / "docs" / "index.css").read_text(), "body { margin: 0; }")
+
+    def test_minify_gzip(self):
+        def gzipped(rel_path):
+            return gzip.decompress((self.root / "docs" / f"{rel_path}.gz").read_bytes())
+
+        (self.root / "template.html").write_text(TEMPLATE.replace("><", ">\n  <"))
+        self.build(gzip=True)
+        for minify in (True, False):
+            with self.subTest(minify=minify):
+                self.build(gzip=True, minify=minify)
+                for rel_path in ("index.css", "index.html", "blog/post.html"):
+                    self.assertEqual(gzipped(rel_path), (self.root / "docs" / rel_path).read_bytes())
+        self.assertEqual(gzipped("index.css"), b"body { margin: 0; }")
+
+    def test_page_changed(self):
+        self.build()
+        (self.root / "content" / "blog" / "post.md").write_text("# Post\n\nOther _text_.")
+        self.assertListEqual(self.build(), ["blog/post.md"])
+        self.assertIn("<i>text</i>", (self.root / "docs" / "blog" / "post.html").read_text())
+
+    def test_template_or_basepath_changed(self):
+        self.build()
+        (self.root / "template.html").write_text(TEMPLATE.replace("<body>", "<body><nav></nav>"))
+        self.assertListEqual(self.build(), ["blog/post.md", "index.md"])
+        self.assertListEqual(self.build("/site/"), ["blog/post.md", "index.md"])
+        self.assertIn('href="/site/blog/post"', (self.root / "docs" / "index.html").read_text())
+
+    def test_output_missing(self):
+        self.build()
+        (self.root / "docs" / "index.html").unlink()
+        (self.root / "docs" / "index.css").unlink()
+        self.assertListEqual(self.build(), ["index.md"])
+        self.assertListEqual(self.outputs(), ["blog/post.html", "images/logo.png", "index.css", "index.html"])
+
+    def test_static_changed(self):
+        self.build()
+        (self.root / "static" / "index.css").write_text("body { margin: 1em; }")
+        self.assertListEqual(self.build(), [])
+        self.assertEqual((self.root / "docs" / "index.css").read_text(), "body { margin: 1em; }")
+
+    def test_sources_removed(self):
+        self.build()
+        (self.root / "content" / "blog" / "post.md").unlink()
+        (self.root / "static" / "images" / "logo.png").unlink()
+        self.assertListEqual(self.build(), [])
+        self.assertListEqual(self.outputs(), ["index.css", "index.html"])
+        self.assertFalse((self.root / "docs" / "blog").exists())
+        self.assertFalse((self.root / "docs" / "images").exists())
+
+    def test_without_manifest(self):
+        self.build()
+        (self.root / "docs" / "orphan.html").write_text("")
+        (self.root / ".cache" / "manifest.json").unlink()
+        self.assertListEqual(self.build(), ["blog/post.md", "index.md"])
+        self.assertNotIn("orphan.html", self.outputs())
+
+    def test_identical_outputs_untouched(self):
+        self.build()
+        public = self.root / "docs"
+        stats = {path: (path.stat().st_ino, path.stat().st_mtime_ns) for path in public.glob("**/*") if path.is_file()}
+        (self.root / ".cache" / "manifest.json").unlink()
+        (self.root / "content" / "blog" / "post.md").write_text("# Post\n\nOther **text**.")
+        with mock.patch("builtins.print") as print_:
+            self.assertListEqual(self.build(), ["blog/post.md", "index.md"])
+        print_.assert_any_call("Pages: 1 written, 1 unchanged")
+        print_.assert_any_call("Static files: 0 copied, 2 unchanged")
+        for path, stat in stats.items():
+            with self.subTest(path=path):
+                self.assertEqual(stat == (path.stat().st_ino, path.stat().st_mtime_ns), path.name != "post.html")
+        self.assertFalse(any(path.name.endswith(".tmp") for path in public.glob("**/.*")))
+
+    def test_gzip(self):
+        self.build(gzip=True)
+        gz_outputs = ["blog/post.html.gz", "index.css.gz", "index.html.gz"]
+        self.assertLessEqual(set(gz_outputs), set(self.outputs()))
+        self.assertNotIn("images/logo.png.gz", self.outputs())
+        post = self.root / "docs" / "blog" / "post.html"
+        self.assertEqual(gzip.decompress(post.with_name("post.html.gz").read_bytes()), post.read_bytes())
+
+        with mock.patch.object(main, "gzip_files", wraps=main.gzip_files) as gzip_files:
+            self.build(gzip=True)
+            self.assertListEqual(gzip_files.call_args.args[0], [])
+            (self.root / "content" / "blog" / "post.md").write_text("# Post\n\nOther _text_.")
+            self.build(gzip=True)
+            self.assertListEqual(gzip_files.call_args.args[0], [post])
+        self.assertEqual(gzip.decompress(post.with_name("post.html.gz").read_bytes()), post.read_bytes())
+
+        self.build()
+        self.assertFalse(any(path.endswith(".gz") for path in self.outputs()))
+
+    def test_swap(self):
+        self.build()
+        live = self.root / "docs"
+        css = (live / "index.css").stat().st_ino
+        (self.root / "content" / "blog" / "post.md").write_text("# Post\n\nOther _text_.")
+        self.assertListEqual(self.build(swap=True), ["blog/post.md"])
+        self.assertIn("<i>text</i>", (live / "blog" / "post.html").read_text())
+        self.assertEqual((live / "index.css").stat().st_ino, css)
+        self.assertIn("<b>text</b>", (self.root / "docs.previous" / "blog" / "post.html").read_text())
+        self.assertFalse((self.root / "docs.staging").exists())
+        self.assertFalse(live.is_symlink())
+        self.assertTrue(live.is_dir())
+
+        (self.root / "content" / "blog" / "broken.md").write_text("No title here")
+        with self.assertRaises(ValueError):
+            self.build(swap=True)
+        self.assertNotIn("blog/broken.html", self.outputs())
+        self.assertFalse((self.root / "docs.staging").exists())
+
+    def test_rollback_missing(self):
+        with mock.patch("sys.argv", ["main.py", "--rollback"]), self.assertRaises(SystemExit) as cm:
+            main.main()
+        self.assertEqual(cm.exception.code, 1)
+        print.assert_called_with(f"Rollback failed: no published output to roll back: {self.root / 'docs'}")
+
+    def test_shard_swap(self):
+        public = self.root / "docs.shard0"
+        self.build(shard=(0, 1), public_path=public, swap=True)
+        (self.root / "content" / "blog" / "post.md").write_text("# Post\n\nOther _text_.")
+        self.assertListEqual(self.build(shard=(0, 1), public_path=public, swap=True), ["blog/post.md"])
+        previous = self.root / "docs.shard0.previous"
+        for rel_path in (main.SHARD_MANIFEST, "blog/post.html"):
+            self.assertFalse((public / rel_path).samefile(previous / rel_path))
+        pages = json.loads((previous / main.SHARD_MANIFEST).read_text())["pages"]
+        self.assertIn("<b>text</b>", (previous / "blog" / "post.html").read_text())
+        self.assertNotEqual(pages["blog/post.md"]["hash"], main.file_hash(self.root / "content" / "blog" / "post.md"))
+
+    def test_shard_merge(self):
+        for i in range(6):
+            (self.root / "content" / "blog" / f"post{i}.md").write_text(f"# Post {i}\n\n[Home](/)")
+        self.build("/site/")
+        public = self.root / "docs"
+        single = {path.relative_to(public): path.read_bytes() for path in public.glob("**/*") if path.is_file()}
+        shutil.rmtree(public)
+        (self.root / ".cache" / "manifest.json").unlink()
+
+        shard_paths = [self.root / f"shard{i}" for i in range(3)]
+        built = []
+        for index, shard_path in enumerate(shard_paths):
+            built.extend(self.build("/site/", shard=(index, 3), public_path=shard_path))
+        pages = sorted(path.with_suffix(".md").as_posix() for path in single if path.suffix == ".html")
+        self.assertListEqual(sorted(built), pages)
+        self.assertFalse(any((shard_path / "index.css").exists() for shard_path in shard_paths))
+        self.assertListEqual(self.build("/site/", shard=(0, 3), public_path=shard_paths[0]), [])
+
+        main.merge_shards(shard_paths)
+        merged = {path.relative_to(public): path.read_bytes() for path in public.glob("**/*") if path.is_file()}
+        self.assertDictEqual(merged, single)
+        self.assertListEqual(self.build("/site/"), [])
+
+        main.merge_shards(shard_paths, gzip=True)
+        for rel_path in pages:
+            html = public / pathlib.Path(rel_path).with_suffix(".html")
+            self.assertEqual(gzip.decompress(html.with_name(f"{html.name}.gz").read_bytes()), html.read_bytes())
+        main.merge_shards(shard_paths)
+        self.assertFalse(any(path.endswith(".gz") for path in self.outputs()))
+
+        with self.assertRaises(ValueError):
+            main.merge_shards(shard_paths[1:])
+
+        for index, shard_path in enumerate(shard_paths):
+            self.build("/site/", shard=(index, 3), public_path=shard_path, fingerprint=True)
+        with self.assertRaises(ValueError):
+            main.merge_shards(shard_paths)
+        main.merge_shards(shard_paths, fingerprint=True)
+        css = json.loads((public / "assets.json").read_text())["index.css"]
+        self.assertIn(f'<link href="/site/{css}">', (public / "index.html").read_text())
+
+    def test_serve_builds(self):
+        options = {
+            "jobs": 1,
+            "flat": False,
+            "link_static": False,
+            "block_cache": None,
+            "gzip": True,
+            "swap": False,
+            "max_in_flight": None,
+            "memory_budget": 0,
+            "search": False,
+            "links": False,
+            "fingerprint": False,
+            "minify": False,
+        }
+        socket_path = self.root / ".cache" / "build.sock"
+        main.build("/site/", **options)
+        thread = threading.Thread(target=main.serve_builds, args=(socket_path, "/site/", options), daemon=True)
+        thread.start()
+        while not socket_path.exists():
+            thread.join(0.01)
+        try:
+            self.check_served_page(socket_path, options)
+        finally:
+            send_request(socket_path, {"command": "shutdown"})
+            thread.join(5)
+
+    def check_served_page(self, socket_path, options):
+        post = self.root / "content" / "blog" / "post.md"
+        post.write_text("# Post\n\nNew **text**.")
+        page = {"command": "build", "pages": [str(post)]}
+        response = send_request(socket_path, {**page, "basepath": "/other/"})
+        self.assertFalse(response["ok"])
+        self.assertIn("basepath", response["error"])
+        response = send_request(socket_path, {"command": "build", "pages": 5})
+        self.assertFalse(response["ok"])
+        self.assertIn("pages must be a list", response["error"])
+
+        self.assertTrue(send_request(socket_path, page)["ok"])
+        html = (self.root / "docs" / "blog" / "post.html").read_text()
+        self.assertIn("New <b>text</b>", html)
+        self.assertEqual(gzip.decompress((self.root / "docs" / "blog" / "post.html.gz").read_bytes()).decode(), html)
+        pages = json.loads((self.root / ".cache" / "manifest.json").read_text())["pages"]
+        self.assertEqual(pages["blog/post.md"]["hash"], main.file_hash(post))
+        self.assertEqual(pages["blog/post.md"]["metadata"]["text_length"], len("PostNew text."))
+        self.assertListEqual(self.build("/site/", **{**options, "jobs": 1}), [])
+
+    def test_parallel(self):
+        for i in range(8):
+            (self.root / "content" / "blog" / f"post{i}.md").write_text(f"# Post {i}\n\n- item {i}")
+        self.build()
+        public = self.root / "docs"
+        serial = {path: path.read_bytes() for path in public.glob("**/*.html")}
+
+        (self.root / ".cache" / "manifest.json").unlink()
+        main.build(jobs=3)
+        self.assertDictEqual({path: path.read_bytes() for path in public.glob("**/*.html")}, serial)
+
+    def test_parallel_bounded(self):
+        for i in range(8):
+            (self.root / "content" / "blog" / f"post{i}.md").write_text(f"# Post {i}\n\n- item {i}")
+        self.build()
+        public = self.root / "docs"
+        serial = {path: path.read_bytes() for path in public.glob("**/*.html")}
+
+        for options in ({"max_in_flight": 2}, {"memory_budget": 1}):
+            with self.subTest(**options):
+                for path in serial:
+                    path.unlink()
+                (self.root / ".cache" / "manifest.json").unlink()
+                main.build(jobs=2, **options)
+                self.assertDictEqual({path: path.read_bytes() for path in public.glob("**/*.html")}, serial)
+
+    def test_parallel_error(self):
+        (self.root / "content" / "blog" / "broken.md").write_text("No title here")
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs), self.assertRaises(ValueError) as cm:
+                main.build(jobs=jobs)
+            self.assertEqual(cm.exception.args[0], "missing h1 heading")
+            self.assertIn(
+                f"while generating page from {self.root / 'content' / 'blog' / 'broken.md'}",
+                cm.exception.__notes__,
+            )
+
+    def test_profile(self):
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                (self.root / ".cache" / "manifest.json").unlink(missing_ok=True)
+                profiler = Profiler()
+                main.build(jobs=jobs, block_cache=None, profiler=profiler)
+                self.assertListEqual(
+                    sorted(page["page"] for page in profiler.pages),
+                    [str(self.root / "content" / "blog" / "post.md"), str(self.root / "content" / "index.md")],
+                )
+                for page in profiler.pages:
+                    self.assertLessEqual(
+                        {"read", "parse_blocks", "parse_inline", "serialize", "template", "write"},
+                        set(page["stages"]),
+                    )
+                self.assertLessEqual({"manifest", "static", "discover", "cleanup"}, set(profiler.build_stages))
+
+        (self.root / ".cache" / "manifest.json").unlink()
+        profiler = Profiler()
+        main.build(profiler=profiler)
+        self.assertIn("render_blocks", profiler.pages[0]["stages"])
+
+    def test_block_cache(self):
+        self.build()
+        uncached = {path: path.read_bytes() for path in (self.root / "docs").glob("**/*.html")}
+        block_cache = (1 << 20, self.root / ".cache" / "blocks")
+        for jobs in (1, 2):
+            (self.root / ".cache" / "manifest.json").unlink()
+            main.build(jobs=jobs, block_cache=block_cache)
+            self.assertDictEqual({path: path.read_bytes() for path in uncached}, uncached)
+        self.assertTrue(any((self.root / ".cache" / "blocks").glob("*/*.json")))
+
+    def test_watch_initial_error(self):
+        (self.root / "content" / "blog" / "broken.md").write_text("No title here")
+        with (
+            mock.patch("sys.argv", ["main.py", "--watch"]),
+            mock.patch.object(main, "serve") as serve,
+            mock.patch.object(main, "watch") as watch,
+        ):
+            main.main()
+        watch.assert_called_once()
+        serve.return_value.shutdown.assert_called_once()
+        with self.assertRaises(ValueError):
+            main.build()
+
+    def test_block_cache_budget(self):
+        self.assertTupleEqual(main.budget_block_cache((64 << 20, None), 256 << 20), (16 << 20, None))
+        self.assertTupleEqual(main.budget_block_cache((1 << 20, None), 256 << 20), (1 << 20, None))
+        self.assertTupleEqual(main.budget_block_cache((64 << 20, None), 0), (64 << 20, None))
+        self.assertIsNone(main.budget_block_cache(None, 256 << 20))
+
+        with mock.patch.object(main.BlockCache, "shared", wraps=main.BlockCache.shared) as shared:
+            main.build(memory_budget=16 << 20)
+        shared.assert_called_with(1 << 20, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
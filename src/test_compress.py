@@ -0,0 +1,43 @@
+import gzip
+import pathlib
+import tempfile
+import unittest
+
+from compress import gzip_file, gzip_files, gzip_path, is_compressible
+
+
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.root = pathlib.Path(self.tmpdir.name)
+
+    def test_is_compressible(self):
+        self.assertTrue(is_compressible("blog/post.html"))
+        self.assertTrue(is_compressible("index.css"))
+        self.assertFalse(is_compressible("images/logo.png"))
+        self.assertFalse(is_compressible("index.html.gz"))
+
+    def test_gzip_file(self):
+        path = self.root / "index.html"
+        path.write_text("<p>hello</p>" * 100)
+        size, gz_size = gzip_file(path)
+        self.assertEqual(size, 1200)
+        self.assertLess(gz_size, size)
+        self.assertEqual(gzip.decompress(gzip_path(path).read_bytes()), path.read_bytes())
+
+        first = gzip_path(path).read_bytes()
+        gzip_file(path)
+        self.assertEqual(gzip_path(path).read_bytes(), first)
+
+    def test_gzip_files_parallel(self):
+        paths = [self.root / f"page{i}.html" for i in range(4)]
+        for i, path in enumerate(paths):
+            path.write_text(f"<p>{i}</p>")
+        self.assertEqual(len(gzip_files(paths, jobs=2)), 4)
+        for path in paths:
+            self.assertEqual(gzip.decompress(gzip_path(path).read_bytes()), path.read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import pathlib
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from client import send_request
+from daemon import BuildDaemon
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.socket_path = pathlib.Path(self.tmpdir.name) / "build.sock"
+
+        patcher = mock.patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_requests(self):
+        requests = []
+
+        def run(request):
+            requests.append(request)
+            if request.get("pages") == 5:
+                raise TypeError("'int' object is not iterable")
+            if request.get("pages") == ["broken.md"]:
+                exc = ValueError("missing h1 heading", "broken.md")
+                exc.add_note("while generating page from broken.md")
+                raise exc
+            sys.stdout.write("Built\n")
+
+        daemon = BuildDaemon(self.socket_path, run)
+        daemon.timeout = 0.05
+        thread = threading.Thread(target=daemon.serve)
+        thread.start()
+        self.addCleanup(daemon.server_close)
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(setattr, daemon, "stopped", True)
+
+        response = send_request(self.socket_path, {"command": "build", "basepath": "/site/"})
+        self.assertTrue(response["ok"])
+        self.assertTrue(response["output"].startswith("Built\n"))
+
+        response = send_request(self.socket_path, {"command": "build", "pages": ["broken.md"]})
+        self.assertFalse(response["ok"])
+        self.assertIn("missing h1 heading", response["error"])
+        self.assertIn("while generating page from broken.md", response["error"])
+
+        response = send_request(self.socket_path, {"command": "build", "pages": 5})
+        self.assertFalse(response["ok"])
+        self.assertIn("TypeError", response["error"])
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(self.socket_path))
+            sock.sendall(b"[1, 2]\n")
+            self.assertIn(b"request must be a JSON object", sock.makefile("rb").readline())
+
+        self.assertTrue(send_request(self.socket_path, {"command": "shutdown"})["ok"])
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertListEqual([request.get("basepath") for request in requests], ["/site/", None, None])
+
+        daemon.server_close()
+        self.assertFalse(self.socket_path.exists())
+
+    def test_no_reply(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(self.socket_path))
+            server.listen()
+
+            def accept():
+                conn = server.accept()[0]
+                conn.makefile("rb").readline()
+                conn.close()
+
+            thread = threading.Thread(target=accept)
+            thread.start()
+            response = send_request(self.socket_path, {"command": "build"})
+            thread.join(5)
+        self.assertFalse(response["ok"])
+        self.assertIn("without replying", response["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from blocknode import BlockNode
+from flatdoc import FlatDocument, NodeKind
+from htmlnode import LeafNode, ParentNode
+from urls import URLResolver
+
+
+class TestFlatDocument(unittest.TestCase):
+    md = """
+# Tolkien Fan Club
+
+![JRR Tolkien sitting](/images/tolkien.png)
+
+Here's the deal, **I like Tolkien**
+and _his_ `books`.
+
+> "I am in fact a Hobbit in all but size."
+>
+> -- J.R.R. Tolkien
+
+- [Glorfindel](/blog/glorfindel)
+- [Tom](/blog/tom)
+
+1. Gandalf
+2. Bilbo
+
+```
+code _stays_ **raw**
+```
+"""
+
+    def test_from_document(self):
+        doc = FlatDocument.from_document(self.md)
+        self.assertEqual(doc.to_html(), BlockNode.from_document(self.md).to_html())
+        self.assertEqual(doc.to_tree(), BlockNode.from_document(self.md))
+
+    def test_resolve_url(self):
+        resolve_url = URLResolver("/site/")
+        doc = FlatDocument.from_document(self.md, resolve_url)
+        self.assertEqual(doc.to_html(), BlockNode.from_document(self.md, resolve_url).to_html())
+        self.assertIn('src="/site/images/tolkien.png"', doc.to_html())
+
+    def test_structure(self):
+        doc = FlatDocument.from_document("# Title\n\n- one\n- two")
+        self.assertEqual(doc.kinds[0], NodeKind.PARENT)
+        self.assertEqual(doc.tag(0), "div")
+        self.assertListEqual([doc.tag(i) for i in doc.children()], ["h1", "ul"])
+
+        heading, items = doc.children()
+        self.assertEqual(doc.value(next(doc.children(heading))), "Title")
+        self.assertListEqual([doc.tag(i) for i in doc.children(items)], ["li", "li"])
+        self.assertListEqual(
+            [doc.value(next(doc.children(i))) for i in doc.children(items)],
+            ["one", "two"],
+        )
+
+    def test_tree_roundtrip(self):
+        tree = ParentNode(
+            "div",
+            [
+                ParentNode("p", [LeafNode(None, "text"), LeafNode("a", "link", {"href": "/", "disabled": True})]),
+                LeafNode("img", "", {"src": "/a.png"}),
+            ],
+            {"class": "content"},
+        )
+        doc = FlatDocument.from_tree(tree)
+        self.assertEqual(len(doc), 5)
+        self.assertEqual(doc.to_tree(), tree)
+        self.assertEqual(doc.to_html(), tree.to_html())
+        self.assertEqual(doc.to_tree(1), tree.children[0])
+
+    def test_missing_children(self):
+        doc = FlatDocument.from_tree(ParentNode("div", [ParentNode("p", [])]))
+        with self.assertRaises(ValueError):
+            doc.to_html()
+
+    def test_unclosed(self):
+        doc = FlatDocument()
+        doc.open("div")
+        with self.assertRaises(ValueError):
+            doc.finish()
+
+
+if __name__ == "__main__":
+    unittest.main()
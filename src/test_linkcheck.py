@@ -0,0 +1,60 @@
+import unittest
+
+from linkcheck import check_links, output_urls
+from urls import URLResolver
+
+
+def page(output, links=(), images=(), headings=()):
+    return {"output": output, "metadata": {"links": list(links), "images": list(images), "headings": list(headings)}}
+
+
+class TestLinkCheck(unittest.TestCase):
+    def setUp(self):
+        self.resolve_url = URLResolver("/site/")
+
+    def test_output_urls(self):
+        self.assertTupleEqual(
+            output_urls("blog/tom/index.html", self.resolve_url),
+            ("/site/blog/tom/", "/site/blog/tom/index.html", "/site/blog/tom"),
+        )
+        self.assertTupleEqual(output_urls("index.html", self.resolve_url), ("/site/", "/site/index.html", "/site"))
+        self.assertTupleEqual(output_urls("about.html", self.resolve_url), ("/site/about.html", "/site/about"))
+        self.assertTupleEqual(output_urls("index.css", self.resolve_url), ("/site/index.css",))
+
+    def test_check_links(self):
+        pages = {
+            "index.md": page(
+                "index.html",
+                links=[
+                    "/site/blog/tom",
+                    "/site/blog/tom/#bombadil",
+                    "/site/blog/tom#missing",
+                    "/site/blog/bilbo",
+                    "#home",
+                    "blog/tom/?page=2",
+                    "/other/",
+                    "//example.com/site/x",
+                    "https://example.com/",
+                    "mailto:tom@example.com",
+                ],
+                images=["/site/images/tom.png", "/site/images/bilbo.png", "/site/index.css#x"],
+                headings=[[1, "Home", "home"]],
+            ),
+            "blog/tom/index.md": page("blog/tom/index.html", links=["../../"], headings=[[2, "Bombadil", "bombadil"]]),
+        }
+        static = {"images/tom.png": {"output": "images/tom.png"}, "index.css": {"output": "index.css"}}
+        checked, problems = check_links(pages, static, self.resolve_url)
+        self.assertEqual(checked, 10)
+        self.assertListEqual(
+            [(problem["url"], problem["reason"]) for problem in problems],
+            [
+                ("/site/blog/tom#missing", "anchor"),
+                ("/site/blog/bilbo", "missing"),
+                ("/site/images/bilbo.png", "missing"),
+                ("/site/index.css#x", "anchor"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from blockcache import BlockCache
+from blocknode import BlockNode
+from flatdoc import FlatDocument
+from metadata import PageMetadata, slugify
+from urls import URLResolver
+
+
+class TestPageMetadata(unittest.TestCase):
+    md = """
+# Tolkien **Fan** Club
+
+![JRR Tolkien sitting](/images/tolkien.png)
+
+## Here's the _deal_
+
+- [Glorfindel](/blog/glorfindel)
+- [Tom](https://example.com/tom)
+
+```
+[not a link](/code)
+```
+"""
+
+    def test_collect(self):
+        metadata = PageMetadata()
+        BlockNode.from_document(self.md, metadata=metadata)
+        self.assertEqual(metadata.title, "Tolkien ")
+        self.assertListEqual(
+            metadata.headings,
+            [[1, "Tolkien Fan Club", "tolkien-fan-club"], [2, "Here's the deal", "heres-the-deal"]],
+        )
+        self.assertListEqual(metadata.links, ["/blog/glorfindel", "https://example.com/tom"])
+        self.assertListEqual(metadata.images, ["/images/tolkien.png"])
+        self.assertEqual(
+            metadata.text_length,
+            len("Tolkien Fan Club" + "Here's the deal" + "Glorfindel" + "Tom" + "[not a link](/code)"),
+        )
+
+    def test_same_in_every_mode(self):
+        resolve_url = URLResolver("/site/")
+        tree = PageMetadata()
+        BlockNode.from_document(self.md, resolve_url, tree)
+        self.assertListEqual(tree.images, ["/site/images/tolkien.png"])
+
+        flat = PageMetadata()
+        FlatDocument.from_document(self.md, resolve_url, flat)
+        self.assertEqual(flat, tree)
+
+        cache = BlockCache()
+        for _ in range(2):
+            cached = PageMetadata()
+            for block in BlockNode.iter_blocks(self.md.split("\n")):
+                cache.render(block, resolve_url, cached)
+            self.assertEqual(cached, tree)
+
+    def test_roundtrip(self):
+        metadata = PageMetadata()
+        BlockNode.from_document(self.md, metadata=metadata)
+        self.assertEqual(PageMetadata.from_dict(metadata.to_dict()), metadata)
+
+    def test_terms(self):
+        metadata = PageMetadata()
+        BlockNode.from_document(self.md, metadata=metadata)
+        self.assertIsNone(metadata.terms)
+        self.assertNotIn("terms", metadata.to_dict())
+
+        cache = BlockCache()
+        for render in (
+            lambda metadata: BlockNode.from_document(self.md, metadata=metadata),
+            lambda metadata: FlatDocument.from_document(self.md, metadata=metadata),
+            lambda metadata: [cache.render(block, metadata=metadata) for block in BlockNode.blocks_from_text(self.md)],
+        ):
+            with_terms = PageMetadata(terms={})
+            render(with_terms)
+            self.assertEqual(with_terms.terms["tolkien"], 1)
+            self.assertNotIn("link", with_terms.terms)
+            self.assertGreater(with_terms.size(), metadata.size())
+            self.assertEqual(PageMetadata.from_dict(with_terms.to_dict()), with_terms)
+
+    def test_slugify(self):
+        self.assertEqual(slugify("  Hello, World -- again "), "hello-world-again")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from minify import HTMLMinifier, minify_css
+
+
+def minify(*chunks):
+    minifier = HTMLMinifier()
+    html = "".join(minifier.iter_minify(chunks))
+    return html, minifier
+
+
+class TestHTMLMinifier(unittest.TestCase):
+    def test_block_whitespace(self):
+        page = "<html>\n  <head>\n    <title>A</title>\n  </head>\n  <body>\n    <p>Hi</p>\n  </body>\n</html>\n"
+        html, _ = minify(page)
+        self.assertEqual(html, "<html><head><title>A</title></head><body><p>Hi</p></body></html>")
+
+    def test_inline_whitespace(self):
+        html, _ = minify("<p>Some  <b>bold</b>\n  <i>text</i>  and\tmore </p>")
+        self.assertEqual(html, "<p>Some <b>bold</b> <i>text</i> and more</p>")
+
+    def test_pre_preserved(self):
+        code = '<pre><code>def f():\n    return  "<b>"\n\n</code></pre>'
+        html, _ = minify("<div>\n  ", code, "\n  <p>a  b</p>\n</div>")
+        self.assertEqual(html, f"<div>{code}<p>a b</p></div>")
+
+    def test_chunk_boundaries(self):
+        chunks = ["<di", 'v class="a', '">\n Hel', "lo ", " <b", ">wor", "ld</b>  </div>"]
+        html, _ = minify(*chunks)
+        self.assertEqual(html, '<div class="a">Hello <b>world</b></div>')
+        self.assertEqual(html, minify("".join(chunks))[0])
+
+    def test_sizes(self):
+        html, minifier = minify("<p>\n  café\n</p>\n")
+        self.assertEqual(html, "<p>café</p>")
+        self.assertEqual(minifier.input_size, 17)
+        self.assertEqual(minifier.output_size, 12)
+
+
+class TestMinifyCSS(unittest.TestCase):
+    def test_minify(self):
+        css = '/* x */\nh1, h2 > a {\n  color: #fff;\n  content: "a ; b" ;\n}\n\na:hover { margin : 0 auto; }\n'
+        self.assertEqual(minify_css(css), 'h1,h2>a{color:#fff;content:"a ; b"}a:hover{margin :0 auto}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import tracemalloc
+import unittest
+
+from blocknode import BlockNode, BlockType
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+NODE_COUNT = 10000
+BYTES_PER_NODE_BEFORE_SLOTS = {
+    "LeafNode": 88,
+    "LinkLeafNode": 272,
+    "ParentNode": 144,
+    "TextNode": 88,
+    "BlockNode": 80,
+}
+
+NODE_FACTORIES = {
+    "LeafNode": lambda text: LeafNode(None, text),
+    "LinkLeafNode": lambda text: LeafNode("a", text, {"href": text}),
+    "ParentNode": lambda _text: ParentNode("p", []),
+    "TextNode": lambda text: TextNode(text, TextType.TEXT),
+    "BlockNode": lambda text: BlockNode(text, BlockType.PARAGRAPH),
+}
+
+
+def bytes_per_node(factory):
+    texts = [f"text {i}" for i in range(NODE_COUNT)]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        nodes = [factory(text) for text in texts]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before - nodes.__sizeof__()) / NODE_COUNT
+
+
+class TestNodeMemory(unittest.TestCase):
+    def test_no_instance_dict(self):
+        for name, factory in NODE_FACTORIES.items():
+            with self.subTest(name=name):
+                self.assertFalse(hasattr(factory("text"), "__dict__"))
+
+    def test_bytes_per_node(self):
+        for name, factory in NODE_FACTORIES.items():
+            with self.subTest(name=name):
+                self.assertLessEqual(bytes_per_node(factory), BYTES_PER_NODE_BEFORE_SLOTS[name] - 16)
+
+    def test_interned_tags(self):
+        tag = "spans"[:-1]
+        self.assertIs(LeafNode(tag, "text").tag, ParentNode("span", []).tag)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import pathlib
+import tempfile
+import unittest
+
+from output import same_contents, write_if_changed
+
+
+class TestOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.root = pathlib.Path(self.tmpdir.name)
+
+    def test_write_if_changed(self):
+        path = self.root / "blog" / "index.html"
+        self.assertTrue(write_if_changed(path, ["<p>", "one", "</p>"]))
+        inode = path.stat().st_ino
+        self.assertFalse(write_if_changed(path, iter(["<p>one</p>"])))
+        self.assertEqual(path.stat().st_ino, inode)
+        self.assertTrue(write_if_changed(path, ["<p>two</p>"]))
+        self.assertEqual(path.read_text(), "<p>two</p>")
+        self.assertListEqual([child.name for child in path.parent.iterdir()], ["index.html"])
+
+    def test_write_error_keeps_output(self):
+        path = self.root / "index.html"
+        path.write_text("<p>one</p>")
+
+        def chunks():
+            yield "<p>"
+            raise ValueError("broken")
+
+        with self.assertRaises(ValueError):
+            write_if_changed(path, chunks())
+        self.assertEqual(path.read_text(), "<p>one</p>")
+        self.assertListEqual([child.name for child in self.root.iterdir()], ["index.html"])
+
+    def test_same_contents(self):
+        (self.root / "a").write_text("abc")
+        (self.root / "b").write_text("abd")
+        (self.root / "c").write_text("abc")
+        self.assertFalse(same_contents(self.root / "a", self.root / "b"))
+        self.assertTrue(same_contents(self.root / "a", self.root / "c"))
+        self.assertFalse(same_contents(self.root / "a", self.root / "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
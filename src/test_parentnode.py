@@ -1,3 +1,4 @@
+import io
 import unittest
 from typing import ClassVar
 
@@ -74,6 +75,49 @@ class TestParentNode(unittest.TestCase):
         node2_html = '<div class="flex flex-column"><div><p style="bold;">This is a paragraph</p></div><a href="https://www.example.com" disabled>This is a link</a></div>'
         self.assertEqual(node2.to_html(), node2_html)
 
+    def test_iter_html(self):
+        leaf = LeafNode(self.leaf_tag, self.leaf_value, self.leaf_props)
+        leaf2 = LeafNode(self.leaf2_tag, self.leaf2_value, self.leaf2_props)
+        node = ParentNode(self.parent_tag, [leaf])
+        node2 = ParentNode(self.parent2_tag, [node, leaf2], props=self.parent2_props)
+
+        self.assertListEqual(
+            list(node2.iter_html()),
+            [
+                '<div class="flex flex-column">',
+                "<div>",
+                '<p style="bold;">This is a paragraph</p>',
+                "</div>",
+                '<a href="https://www.example.com" disabled>This is a link</a>',
+                "</div>",
+            ],
+        )
+
+    def test_write_html(self):
+        leaf = LeafNode(self.leaf_tag, self.leaf_value, self.leaf_props)
+        node = ParentNode(self.parent2_tag, [ParentNode(self.parent_tag, [leaf]), leaf], props=self.parent2_props)
+
+        fp = io.StringIO()
+        node.write_html(fp)
+        self.assertEqual(fp.getvalue(), node.to_html())
+
+    def test_html_deep(self):
+        depth = 10000
+        node = LeafNode(None, "text")
+        for _ in range(depth):
+            node = ParentNode("span", [node])
+        self.assertEqual(node.to_html(), "<span>" * depth + "text" + "</span>" * depth)
+
+    def test_html_wide(self):
+        leaf = LeafNode(self.leaf_tag, self.leaf_value)
+        node = ParentNode("ul", [ParentNode("li", [leaf])] * 10000)
+        self.assertEqual(node.to_html(), "<ul>" + "<li><p>This is a paragraph</p></li>" * 10000 + "</ul>")
+
+    def test_html_missing_children(self):
+        node = ParentNode(self.parent_tag, [ParentNode(self.parent_tag, [])])
+        with self.assertRaises(ValueError):
+            node.to_html()
+
 
 if __name__ == "__main__":
     unittest.main()
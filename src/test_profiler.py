@@ -0,0 +1,56 @@
+import json
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import profiler as profiler_module
+from profiler import NULL_PROFILER, Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        clock = iter(range(0, 10_000, 10))
+        patcher = mock.patch.object(profiler_module.time, "perf_counter_ns", lambda: next(clock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_exclusive_stages(self):
+        profiler = Profiler()
+        with profiler.page("index.md"):
+            lines = profiler.iterate("read", ["a", "b"])
+            with profiler.stage("parse"):
+                self.assertListEqual(list(lines), ["a", "b"])
+        with profiler.stage("static"):
+            pass
+
+        page = profiler.pages[0]
+        self.assertEqual(page["page"], "index.md")
+        self.assertDictEqual(page["stages"], {"parse": 40, "read": 30})
+        self.assertDictEqual(profiler.totals(), {"parse": 40, "read": 30, "static": 10})
+
+    def test_report(self):
+        profiler = Profiler()
+        for name in ("a.md", "b.md"):
+            with profiler.page(name), profiler.stage("write"):
+                pass
+        self.assertListEqual([page["page"] for page in profiler.slowest(1)], ["a.md"])
+        self.assertIn("write", profiler.report())
+        self.assertEqual(profiler.to_json()["totals_ns"], {"write": 20})
+
+        events = profiler.trace_events()
+        self.assertListEqual([event["name"] for event in events], ["a.md", "write", "b.md", "write"])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir) / "trace.json"
+            profiler.write_trace(path)
+            self.assertEqual(len(json.loads(path.read_text())["traceEvents"]), 4)
+
+    def test_null_profiler(self):
+        items = [1, 2]
+        self.assertIs(NULL_PROFILER.iterate("read", items), items)
+        with NULL_PROFILER.page("index.md"), NULL_PROFILER.stage("read"):
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
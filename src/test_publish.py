@@ -0,0 +1,89 @@
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from output import write_if_changed
+from publish import exchange, previous_path, rollback, staged, staging_path
+
+
+class TestPublish(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.public = pathlib.Path(self.tmpdir.name) / "docs"
+        self.public.mkdir()
+        (self.public / "index.html").write_text("old")
+
+        patcher = mock.patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_staged(self):
+        with staged(self.public) as staging:
+            self.assertEqual(staging, staging_path(self.public))
+            self.assertTrue((staging / "index.html").samefile(self.public / "index.html"))
+            (staging / "new.html").write_text("new")
+            self.assertFalse((self.public / "new.html").exists())
+        self.assertFalse(staging.exists())
+        self.assertEqual((self.public / "new.html").read_text(), "new")
+        self.assertEqual((previous_path(self.public) / "index.html").read_text(), "old")
+        self.assertFalse((previous_path(self.public) / "new.html").exists())
+
+    def test_staged_exchange(self):
+        inode = self.public.stat().st_ino
+        with staged(self.public) as staging:
+            staged_inode = staging.stat().st_ino
+        self.assertFalse(self.public.is_symlink())
+        self.assertEqual(self.public.stat().st_ino, staged_inode)
+        self.assertEqual(previous_path(self.public).stat().st_ino, inode)
+
+        with mock.patch("publish.exchange", return_value=False), staged(self.public) as staging:
+            write_if_changed(staging / "index.html", ["fallback"])
+        self.assertEqual((self.public / "index.html").read_text(), "fallback")
+        self.assertFalse(staging_path(self.public).exists())
+
+    def test_exchange(self):
+        other = self.public.with_name("other")
+        other.mkdir()
+        (other / "index.html").write_text("other")
+        self.assertTrue(exchange(other, self.public))
+        self.assertEqual((self.public / "index.html").read_text(), "other")
+        self.assertEqual((other / "index.html").read_text(), "old")
+
+    def test_staged_error(self):
+        with self.assertRaises(ValueError), staged(self.public) as staging:
+            (staging / "new.html").write_text("new")
+            raise ValueError("broken")
+        self.assertFalse(staging_path(self.public).exists())
+        self.assertFalse(previous_path(self.public).exists())
+        self.assertListEqual([path.name for path in self.public.iterdir()], ["index.html"])
+
+    def test_staged_first_build(self):
+        (self.public / "index.html").unlink()
+        self.public.rmdir()
+        with staged(self.public) as staging:
+            (staging / "index.html").write_text("new")
+        self.assertEqual((self.public / "index.html").read_text(), "new")
+        self.assertFalse(previous_path(self.public).exists())
+
+    def test_rollback(self):
+        with self.assertRaises(ValueError):
+            rollback(self.public)
+        with staged(self.public) as staging:
+            write_if_changed(staging / "index.html", ["new"])
+        rollback(self.public)
+        self.assertEqual((self.public / "index.html").read_text(), "old")
+        self.assertEqual((previous_path(self.public) / "index.html").read_text(), "new")
+        self.assertFalse(staging_path(self.public).exists())
+
+    def test_rollback_missing(self):
+        (self.public / "index.html").unlink()
+        self.public.rmdir()
+        with self.assertRaises(ValueError) as cm:
+            rollback(self.public)
+        self.assertEqual(cm.exception.args[1], self.public)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import copy
+import json
+import pathlib
+import tempfile
+import unittest
+
+from search import SEARCH_PAGES, update_search_index
+from urls import URLResolver
+
+
+def page(output, title, terms):
+    return {"output": output, "metadata": {"title": title, "terms": terms}}
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.public = pathlib.Path(self.tmpdir.name)
+        self.resolve_url = URLResolver("/site/")
+
+    def update(self, pages, old_pages, changed, old_files=(), rebuild=False):
+        return update_search_index(
+            self.public,
+            pages,
+            old_pages,
+            changed,
+            resolve_url=self.resolve_url,
+            old_files=old_files,
+            rebuild=rebuild,
+        )
+
+    def read(self, rel_path):
+        return json.loads((self.public / rel_path).read_text())
+
+    def test_full(self):
+        pages = {
+            "index.md": page("index.html", "Home", {"hobbit": 2, "ring": 1}),
+            "blog/tom.md": page("blog/tom/index.html", "Tom", {"hobbit": 1, "tom": 3}),
+        }
+        files, written = self.update(pages, {}, set(pages), rebuild=True)
+        self.assertListEqual(files, ["search/ho.json", "search/pages.json", "search/ri.json", "search/to.json"])
+        self.assertEqual(written, 4)
+        self.assertListEqual(self.read(SEARCH_PAGES), [["/site/blog/tom/", "Tom"], ["/site/", "Home"]])
+        self.assertDictEqual(self.read("search/ho.json"), {"hobbit": [[0, 1], [1, 2]]})
+
+    def test_incremental(self):
+        old_pages = {
+            "index.md": page("index.html", "Home", {"hobbit": 2, "ring": 1}),
+            "blog/tom.md": page("blog/tom/index.html", "Tom", {"hobbit": 1, "tom": 3}),
+        }
+        old_files, _ = self.update(old_pages, {}, set(old_pages), rebuild=True)
+        ring = (self.public / "search" / "ri.json").stat().st_ino
+
+        pages = {
+            "index.md": page("index.html", "Home", {"hobbit": 2, "ring": 1}),
+            "blog/bilbo.md": page("blog/bilbo/index.html", "Bilbo", {"hobbit": 5}),
+        }
+        files, written = self.update(pages, old_pages, set(), old_files)
+        self.assertListEqual(files, ["search/ho.json", "search/pages.json", "search/ri.json"])
+        self.assertEqual(written, 2)
+        self.assertEqual(pages["index.md"]["search_id"], 1)
+        self.assertEqual(pages["blog/bilbo.md"]["search_id"], 0)
+        self.assertDictEqual(self.read("search/ho.json"), {"hobbit": [[0, 5], [1, 2]]})
+        self.assertListEqual(self.read(SEARCH_PAGES), [["/site/blog/bilbo/", "Bilbo"], ["/site/", "Home"]])
+        self.assertEqual((self.public / "search" / "ri.json").stat().st_ino, ring)
+
+        new_pages = copy.deepcopy(pages)
+        new_pages["index.md"]["metadata"]["terms"] = {"hobbit": 2}
+        files, _ = self.update(new_pages, pages, {"index.md"}, files)
+        self.assertListEqual(files, ["search/ho.json", "search/pages.json"])
+
+    def test_compact(self):
+        old_pages = {f"p{i}.md": page(f"p{i}.html", f"P{i}", {"hobbit": i + 1}) for i in range(4)}
+        old_files, _ = self.update(old_pages, {}, set(old_pages), rebuild=True)
+
+        pages = {"p0.md": page("p0.html", "P0", {"hobbit": 1}), "p3.md": page("p3.html", "P3", {"hobbit": 4})}
+        files, _ = self.update(pages, old_pages, set(), old_files)
+        self.assertListEqual(self.read(SEARCH_PAGES), [["/site/p0.html", "P0"], None, None, ["/site/p3.html", "P3"]])
+
+        new_pages = copy.deepcopy(pages)
+        del new_pages["p0.md"]
+        self.update(new_pages, pages, set(), files)
+        self.assertEqual(new_pages["p3.md"]["search_id"], 0)
+        self.assertListEqual(self.read(SEARCH_PAGES), [["/site/p3.html", "P3"]])
+        self.assertDictEqual(self.read("search/ho.json"), {"hobbit": [[0, 4]]})
+
+
+if __name__ == "__main__":
+    unittest.main()
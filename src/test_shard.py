@@ -0,0 +1,45 @@
+import pathlib
+import tempfile
+import unittest
+
+from manifest import Manifest
+from shard import SHARD_MANIFEST, load_shards, parse_shard, shard_of
+
+
+class TestShard(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("0/3"), (0, 3))
+        self.assertEqual(parse_shard("2/3"), (2, 3))
+        for text in ("3/3", "1", "-1/3", "a/b", "1/0"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_shard(text)
+
+    def test_shard_of(self):
+        paths = [f"blog/post{i}.md" for i in range(300)]
+        shards = [shard_of(path, 3) for path in paths]
+        self.assertListEqual(shards, [shard_of(pathlib.PurePath(path), 3) for path in paths])
+        self.assertSetEqual(set(shards), {0, 1, 2})
+        self.assertTrue(all(shard_of(path, 1) == 0 for path in paths))
+
+    def test_load_shards(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = pathlib.Path(tmpdir)
+            paths = [root / "shard0", root / "shard1"]
+            with self.assertRaises(ValueError):
+                load_shards(paths)
+
+            for index, path in enumerate(paths):
+                Manifest("/", "abc", shard=[index, 2]).save(path / SHARD_MANIFEST)
+            self.assertListEqual([shard_manifest.shard for _, shard_manifest in load_shards(paths)], [[0, 2], [1, 2]])
+            with self.assertRaises(ValueError):
+                load_shards(paths[:1])
+            with self.assertRaises(ValueError):
+                load_shards([paths[0], paths[0]])
+
+            Manifest("/site/", "abc", shard=[1, 2]).save(paths[1] / SHARD_MANIFEST)
+            with self.assertRaises(ValueError):
+                load_shards(paths)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import staticsync
+from staticsync import copy_file, sync_static
+
+
+class TestStaticSync(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        root = pathlib.Path(self.tmpdir.name)
+        self.static = root / "static"
+        self.public = root / "docs"
+        (self.static / "images").mkdir(parents=True)
+        (self.static / "index.css").write_text("body { margin: 0; }")
+        (self.static / "images" / "logo.png").write_bytes(b"\x89PNG")
+
+        patcher = mock.patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sync(self, entries=None, link=False, **options):
+        with mock.patch.object(staticsync, "copy_file", wraps=staticsync.copy_file) as copy:
+            entries, copied = sync_static(self.static, self.public, entries or {}, link, **options)
+        if not options.get("minify"):
+            self.assertEqual(copied, copy.call_count)
+        return entries, sorted(call.args[0].name for call in copy.call_args_list)
+
+    def test_copy(self):
+        entries, copied = self.sync()
+        self.assertListEqual(copied, ["index.css", "logo.png"])
+        self.assertListEqual(sorted(entries), ["images/logo.png", "index.css"])
+        self.assertEqual(entries["index.css"]["size"], 19)
+        self.assertEqual((self.public / "images" / "logo.png").read_bytes(), b"\x89PNG")
+
+    def test_unchanged(self):
+        entries, _ = self.sync()
+        self.assertListEqual(self.sync(entries)[1], [])
+
+    def test_touched_but_unchanged(self):
+        entries, _ = self.sync()
+        path = self.static / "index.css"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        new_entries, copied = self.sync(entries)
+        self.assertListEqual(copied, [])
+        self.assertEqual(new_entries["index.css"]["hash"], entries["index.css"]["hash"])
+        self.assertNotEqual(new_entries["index.css"]["mtime_ns"], entries["index.css"]["mtime_ns"])
+
+    def test_changed(self):
+        entries, _ = self.sync()
+        path = self.static / "index.css"
+        stat = path.stat()
+        path.write_text("body { margin: 1; }")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertListEqual(self.sync(entries)[1], ["index.css"])
+        self.assertEqual((self.public / "index.css").read_text(), "body { margin: 1; }")
+
+    def test_output_modified(self):
+        entries, _ = self.sync()
+        (self.public / "index.css").write_text("tampered")
+        self.assertListEqual(self.sync(entries)[1], ["index.css"])
+        (self.public / "index.css").unlink()
+        self.assertListEqual(self.sync(entries)[1], ["index.css"])
+
+    def test_existing_output_without_entries(self):
+        self.sync()
+        (self.public / "index.css").write_text("tampered")
+        self.assertListEqual(self.sync()[1], ["index.css"])
+
+    def test_fingerprint(self):
+        entries, _ = self.sync()
+        entries, copied = self.sync(entries, fingerprint=True)
+        self.assertListEqual(copied, ["index.css", "logo.png"])
+        output = entries["index.css"]["output"]
+        self.assertEqual(output, f"index.{entries['index.css']['hash'][:10]}.css")
+        self.assertEqual((self.public / output).read_text(), "body { margin: 0; }")
+        self.assertListEqual(self.sync(entries, fingerprint=True)[1], [])
+
+        (self.static / "index.css").write_text("body { margin: 1; }")
+        new_entries, copied = self.sync(entries, fingerprint=True)
+        self.assertListEqual(copied, ["index.css"])
+        self.assertNotEqual(new_entries["index.css"]["output"], output)
+
+    def test_fingerprint_fixed_names(self):
+        for name in ("CNAME", "robots.txt", "favicon.ico", "about.html"):
+            (self.static / name).write_text(name)
+        entries, _ = self.sync(fingerprint=True)
+        for name in ("CNAME", "robots.txt", "favicon.ico", "about.html"):
+            self.assertEqual(entries[name]["output"], name)
+            self.assertEqual((self.public / name).read_text(), name)
+        self.assertNotEqual(entries["images/logo.png"]["output"], "images/logo.png")
+
+    def test_minify(self):
+        (self.static / "index.css").write_text('/* site */\nbody {\n  margin: 0;\n  font-family: "A  B", serif;\n}\n')
+        entries, _ = self.sync(minify=True)
+        self.assertEqual((self.public / "index.css").read_text(), 'body{margin:0;font-family:"A  B",serif}')
+        self.assertListEqual(entries["index.css"]["minified"], [63, 39])
+        self.assertNotIn("minified", entries["images/logo.png"])
+        self.assertListEqual(self.sync(entries, minify=True)[1], [])
+
+        entries, copied = self.sync(entries)
+        self.assertListEqual(copied, ["index.css"])
+        self.assertNotIn("minified", entries["index.css"])
+        self.assertTrue((self.public / "index.css").read_text().startswith("/* site */"))
+
+    def test_link(self):
+        self.sync(link=True)
+        self.assertTrue((self.public / "index.css").samefile(self.static / "index.css"))
+
+    def test_copy_file_keeps_source(self):
+        source = self.static / "index.css"
+        dest = self.public / "index.css"
+        self.assertEqual(copy_file(source, dest, link=True), "link")
+        self.assertIn(copy_file(self.static / "images" / "logo.png", dest), ("copy", "copy_file_range"))
+        self.assertEqual(source.read_text(), "body { margin: 0; }")
+        self.assertEqual(dest.read_bytes(), b"\x89PNG")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import pathlib
+import tempfile
+import unittest
+
+from template import Template
+from urls import URLResolver
+
+
+class TestTemplate(unittest.TestCase):
+    template_text = '<html><title>{{ Title }}</title><link href="/index.css"><body>{{Content}}</body></html>'
+
+    def test_parse(self):
+        template = Template(self.template_text)
+        self.assertListEqual(template.slots, ["Title", "Content"])
+        self.assertListEqual(
+            template.literals,
+            ["<html><title>", '</title><link href="/index.css"><body>', "</body></html>"],
+        )
+
+    def test_render(self):
+        template = Template(self.template_text)
+        self.assertEqual(
+            template.render(Title="Home", Content="<p>Hello</p>"),
+            '<html><title>Home</title><link href="/index.css"><body><p>Hello</p></body></html>',
+        )
+
+    def test_render_chunks(self):
+        template = Template(self.template_text)
+        chunks = list(template.iter_render(Title="Home", Content=iter(["<p>", "Hello", "</p>"])))
+        self.assertListEqual(
+            chunks,
+            [
+                "<html><title>",
+                "Home",
+                '</title><link href="/index.css"><body>',
+                "<p>",
+                "Hello",
+                "</p>",
+                "</body></html>",
+            ],
+        )
+
+    def test_render_repeated_slot(self):
+        template = Template("{{ Title }} - {{ Title }}")
+        self.assertEqual(template.render(Title="Home"), "Home - Home")
+
+    def test_render_missing_value(self):
+        template = Template(self.template_text)
+        with self.assertRaises(ValueError):
+            template.render(Title="Home")
+
+    def test_basepath(self):
+        template = Template(self.template_text, URLResolver("/site/"))
+        self.assertIn('href="/site/index.css"', template.render(Title="", Content=""))
+
+    def test_basepath_values_untouched(self):
+        template = Template(self.template_text, URLResolver("/site/"))
+        self.assertIn('<a href="/x">', template.render(Title="", Content='<a href="/x">'))
+
+    def test_load_cached(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir) / "template.html"
+            path.write_text(self.template_text)
+            template = Template.load(path)
+            self.assertIs(Template.load(path), template)
+            self.assertIsNot(Template.load(path, URLResolver("/site/")), template)
+            self.assertIs(Template.load(path, URLResolver("/site/")), Template.load(path, URLResolver("/site/")))
+
+            path.write_text("<p>{{ Content }}</p>")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertListEqual(Template.load(path).slots, ["Content"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 
-from textnode import TextNode, TextType
+from textnode import MD_IMG_FORMAT, MD_IMG_RE_PATTERN, MD_LINK_FORMAT, MD_LINK_RE_PATTERN, TextNode, TextType
+from urls import URLResolver
 
 
 class TestTextNode(unittest.TestCase):
@@ -104,6 +105,53 @@ class TestTextNode(unittest.TestCase):
         self.assertEqual(leaf2.value, "")
         self.assertEqual(leaf2.props, {"alt": self.node_text, "src": self.node2_url})
 
+    def test_leaf_resolve_url(self):
+        resolve_url = URLResolver("/site/")
+        link = TextNode(self.node_text, TextType.LINK, "/blog/tom").to_leaf(resolve_url)
+        self.assertEqual(link.props, {"href": "/site/blog/tom"})
+        image = TextNode(self.node_text, TextType.IMAGE, "/images/a.png").to_leaf(resolve_url)
+        self.assertEqual(image.props, {"alt": self.node_text, "src": "/site/images/a.png"})
+        code = TextNode('href="/a"', TextType.CODE).to_leaf(resolve_url)
+        self.assertEqual(code.value, 'href="/a"')
+
+    def test_from_text_single_pass(self):
+        self.assertListEqual(
+            TextNode.from_text("`a_b **c**` and [snake_case](/snake_case_page) and ![x](/my_image.png)"),
+            [
+                TextNode("a_b **c**", TextType.CODE),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("snake_case", TextType.LINK, "/snake_case_page"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("x", TextType.IMAGE, "/my_image.png"),
+            ],
+        )
+        self.assertListEqual(TextNode.from_text("****``__"), [])
+        self.assertListEqual(TextNode.from_text(""), [])
+
+    def test_from_text_unmatched(self):
+        for text in ("an _italic word", "a **bold word", "a `code word", "**a** and **"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                TextNode.from_text(text)
+
+    def test_from_text_many_links(self):
+        text = " and ".join(f"[link {i}](/page/{i}) with ![image {i}](/images/{i}.png)" for i in range(500))
+        nodes = TextNode.from_text(text)
+        self.assertEqual(len(nodes), 2000 - 1)
+        self.assertEqual(nodes[-1], TextNode("image 499", TextType.IMAGE, "/images/499.png"))
+
+        legacy = TextNode.split_nodes_pattern(
+            TextNode.split_nodes_pattern(
+                [TextNode(text, TextType.TEXT)],
+                MD_IMG_RE_PATTERN,
+                TextType.IMAGE,
+                MD_IMG_FORMAT,
+            ),
+            MD_LINK_RE_PATTERN,
+            TextType.LINK,
+            MD_LINK_FORMAT,
+        )
+        self.assertListEqual(nodes, legacy)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,41 @@
+import pickle
+import unittest
+
+from urls import URLResolver
+
+
+class TestURLResolver(unittest.TestCase):
+    def test_site_absolute(self):
+        resolve_url = URLResolver("/site/")
+        self.assertEqual(resolve_url("/"), "/site/")
+        self.assertEqual(resolve_url("/images/a.png"), "/site/images/a.png")
+
+    def test_untouched(self):
+        resolve_url = URLResolver("/site/")
+        for url in ("https://example.com/a", "//cdn.example.com/a", "page.html", "#top", ""):
+            self.assertEqual(resolve_url(url), url)
+
+    def test_rewrite_html(self):
+        resolve_url = URLResolver("/site/")
+        self.assertEqual(
+            resolve_url.rewrite_html('<a href="/a">/b</a><img src="/c.png" alt="/d"><p data-href="/e">'),
+            '<a href="/site/a">/b</a><img src="/site/c.png" alt="/d"><p data-href="/e">',
+        )
+
+    def test_assets(self):
+        resolve_url = URLResolver("/site/", {"index.css": "index.0123456789.css"})
+        self.assertEqual(resolve_url("/index.css"), "/site/index.0123456789.css")
+        self.assertEqual(resolve_url("/index.css?v=1#top"), "/site/index.0123456789.css?v=1#top")
+        self.assertEqual(resolve_url("/other.css"), "/site/other.css")
+        self.assertEqual(resolve_url("index.css"), "index.css")
+        self.assertNotEqual(resolve_url.cache_key, URLResolver("/site/").cache_key)
+        self.assertNotEqual(resolve_url, URLResolver("/site/", {"index.css": "index.9876543210.css"}))
+
+    def test_equality(self):
+        self.assertEqual(URLResolver("/site/"), URLResolver("/site/"))
+        self.assertNotEqual(URLResolver("/site/"), URLResolver("/"))
+        self.assertEqual(pickle.loads(pickle.dumps(URLResolver("/site/"))), URLResolver("/site/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
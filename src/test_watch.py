@@ -0,0 +1,78 @@
+import os
+import pathlib
+import tempfile
+import threading
+import unittest
+import urllib.request
+from unittest import mock
+
+from watch import changed_files, serve, snapshot, try_build, watch
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.root = pathlib.Path(self.tmpdir.name)
+        (self.root / "content").mkdir()
+        (self.root / "content" / "index.md").write_text("# Home")
+        (self.root / "template.html").write_text("{{ Content }}")
+
+        patcher = mock.patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_snapshot(self):
+        paths = [self.root / "content", self.root / "template.html", self.root / "missing"]
+        previous = snapshot(paths)
+        self.assertListEqual(sorted(previous), [self.root / "content" / "index.md", self.root / "template.html"])
+
+        index = self.root / "content" / "index.md"
+        stat = index.stat()
+        os.utime(index, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        (self.root / "content" / "new.md").write_text("# New")
+        (self.root / "template.html").unlink()
+        self.assertListEqual(
+            changed_files(previous, snapshot(paths)),
+            [self.root / "content" / "index.md", self.root / "content" / "new.md", self.root / "template.html"],
+        )
+
+    def test_watch(self):
+        stop = threading.Event()
+        changes = []
+
+        def rebuild(changed):
+            changes.append(changed)
+            stop.set()
+
+        paths = [self.root / "content"]
+        thread = threading.Thread(target=watch, args=(paths, rebuild, 0.01, stop, snapshot(paths)))
+        thread.start()
+        (self.root / "content" / "new.md").write_text("# New")
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertListEqual(changes, [[self.root / "content" / "new.md"]])
+
+    def test_try_build(self):
+        def fail():
+            exc = ValueError("missing h1 heading")
+            exc.add_note("while generating page from content/index.md")
+            raise exc
+
+        with mock.patch("builtins.print") as print_:
+            self.assertTrue(try_build(lambda: None))
+            self.assertFalse(try_build(fail))
+        print_.assert_called_with("  while generating page from content/index.md")
+        with self.assertRaises(KeyError):
+            try_build(lambda: {}["missing"])
+
+    def test_serve(self):
+        server = serve(self.root, port=0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        with urllib.request.urlopen(f"http://localhost:{server.server_port}/template.html") as response:
+            self.assertEqual(response.read(), b"{{ Content }}")
+
+
+if __name__ == "__main__":
+    unittest.main()
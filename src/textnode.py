@@ -8,6 +8,15 @@ MD_IMG_FORMAT = "![{0}]({1})"
 MD_IMG_RE_PATTERN = r"[\!]\[([^\]]*)\]\(([^\)]*)\)"
 MD_LINK_FORMAT = "[{0}]({1})"
 MD_LINK_RE_PATTERN = r"(?<!!)\[([^\]]*)\]\(([^\)]*)\)"
+MD_INLINE_RE = re.compile(
+    r"`(?P<code>[^`]*)`"
+    r"|!\[(?P<image_text>[^\]]*)\]\((?P<image_url>[^\)]*)\)"
+    r"|\[(?P<link_text>[^\]]*)\]\((?P<link_url>[^\)]*)\)"
+    r"|\*\*(?P<bold>.*?)\*\*"
+    r"|_(?P<italic>[^_]*)_",
+    re.DOTALL,
+)
+MD_INLINE_DELIMITERS = ("`", "_", "**")
 
 
 class TextType(Enum):
@@ -19,7 +28,13 @@ class TextType(Enum):
     IMAGE = "image"
 
 
-@dataclass
+def check_plain_text(text):
+    if any(delimiter in text for delimiter in MD_INLINE_DELIMITERS):
+        raise ValueError("unmatched delimiter found")
+    return text
+
+
+@dataclass(slots=True)
 class TextNode:
     text: str
     text_type: TextType
@@ -41,50 +56,76 @@ class TextNode:
         return new_nodes
 
     @classmethod
-    def split_nodes_pattern(cls, old_nodes, pattern, text_type, text_format):
+    def split_nodes_pattern(cls, old_nodes, pattern, text_type, _text_format=None):
         new_nodes = []
         for node in old_nodes:
             if node.text_type != TextType.TEXT:
                 new_nodes.append(node)
             else:
-                node_text = node.text
-                while len(node_text) > 0:
-                    items = re.findall(pattern, node_text)
-                    if items:
-                        item = items[0]
-                        item_text = text_format.format(*item)
-                        pos = node_text.find(item_text)
-                        if pos > 0:
-                            new_nodes.append(cls(node_text[:pos], TextType.TEXT))
-                        new_nodes.append(cls(item[0], text_type, item[1]))
-                        node_text = node_text[pos + len(item_text) :]
-                    else:
-                        new_nodes.append(cls(node_text, TextType.TEXT))
-                        break
+                pos = 0
+                for match in re.finditer(pattern, node.text):
+                    if match.start() > pos:
+                        new_nodes.append(cls(node.text[pos : match.start()], TextType.TEXT))
+                    new_nodes.append(cls(match[1], text_type, match[2]))
+                    pos = match.end()
+                if pos < len(node.text):
+                    new_nodes.append(cls(node.text[pos:], TextType.TEXT))
         return new_nodes
 
+    @staticmethod
+    def iter_tokens(text):
+        pos = 0
+        for token in MD_INLINE_RE.finditer(text):
+            start = token.start()
+            if start > pos:
+                yield check_plain_text(text[pos:start]), TextType.TEXT, None
+            pos = token.end()
+
+            match token.lastgroup:
+                case "code":
+                    if token["code"]:
+                        yield token["code"], TextType.CODE, None
+                case "image_url":
+                    yield token["image_text"], TextType.IMAGE, token["image_url"]
+                case "link_url":
+                    yield token["link_text"], TextType.LINK, token["link_url"]
+                case "bold":
+                    if token["bold"]:
+                        yield token["bold"], TextType.BOLD, None
+                case "italic":
+                    if token["italic"]:
+                        yield token["italic"], TextType.ITALIC, None
+        if pos < len(text):
+            yield check_plain_text(text[pos:]), TextType.TEXT, None
+
+    @classmethod
+    def iter_from_text(cls, text):
+        for token in cls.iter_tokens(text):
+            yield cls(*token)
+
     @classmethod
     def from_text(cls, text):
-        node = cls(text, TextType.TEXT)
-        new_nodes = cls.split_nodes_delimiter([node], "`", TextType.CODE)
-        new_nodes = cls.split_nodes_delimiter(new_nodes, "_", TextType.ITALIC)
-        new_nodes = cls.split_nodes_delimiter(new_nodes, "**", TextType.BOLD)
-        new_nodes = cls.split_nodes_pattern(new_nodes, MD_IMG_RE_PATTERN, TextType.IMAGE, MD_IMG_FORMAT)
-        return cls.split_nodes_pattern(new_nodes, MD_LINK_RE_PATTERN, TextType.LINK, MD_LINK_FORMAT)
-
-    def to_leaf(self):
-        match self.text_type:
+        return list(cls.iter_from_text(text))
+
+    @staticmethod
+    def leaf_parts(text, text_type, url=None, resolve_url=None):
+        if url and resolve_url is not None:
+            url = resolve_url(url)
+        match text_type:
             case TextType.TEXT:
-                return LeafNode(None, self.text)
+                return None, text, None
             case TextType.BOLD:
-                return LeafNode("b", self.text)
+                return "b", text, None
             case TextType.ITALIC:
-                return LeafNode("i", self.text)
+                return "i", text, None
             case TextType.CODE:
-                return LeafNode("code", self.text)
+                return "code", text, None
             case TextType.LINK:
-                return LeafNode("a", self.text, {"href": self.url or ""})
+                return "a", text, {"href": url or ""}
             case TextType.IMAGE:
-                return LeafNode("img", "", {"alt": self.text, "src": self.url or ""})
+                return "img", "", {"alt": text, "src": url or ""}
             case _:
                 raise ValueError("invalid text type")
+
+    def to_leaf(self, resolve_url=None):
+        return LeafNode(*self.leaf_parts(self.text, self.text_type, self.url, resolve_url))
@@ -0,0 +1,39 @@
+import hashlib
+import json
+import re
+
+URL_ATTR_RE = re.compile(r"""(\s(?:href|src)=")([^"]*)(")""")
+
+
+class URLResolver:
+    def __init__(self, basepath="/", assets=None):
+        self.basepath = basepath
+        self.assets = assets or {}
+        self.cache_key = basepath
+        if self.assets:
+            digest = hashlib.sha256(json.dumps(self.assets, sort_keys=True).encode()).hexdigest()
+            self.cache_key = f"{basepath}\0{digest}"
+
+    def __repr__(self):
+        return f"URLResolver(basepath={self.basepath!r}, assets={len(self.assets)})"
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.cache_key == other.cache_key
+
+    def __hash__(self):
+        return hash(self.cache_key)
+
+    def __call__(self, url):
+        if url.startswith("/") and not url.startswith("//"):
+            path = url[1:]
+            if self.assets:
+                path, sep, rest = path.partition("#")
+                path, query_sep, query = path.partition("?")
+                path = f"{self.assets.get(path, path)}{query_sep}{query}{sep}{rest}"
+            return self.basepath + path
+        return url
+
+    def rewrite_html(self, html):
+        return URL_ATTR_RE.sub(lambda match: f"{match[1]}{self(match[2])}{match[3]}", html)
@@ -0,0 +1,63 @@
+import functools
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+def snapshot(paths):
+    files = {}
+    for path in paths:
+        candidates = path.glob("**/*") if path.is_dir() else [path]
+        for candidate in candidates:
+            try:
+                stat = candidate.stat()
+            except FileNotFoundError:
+                continue
+            if not candidate.is_dir():
+                files[candidate] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def changed_files(previous, current):
+    return sorted(path for path in previous.keys() | current.keys() if previous.get(path) != current.get(path))
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *_args):
+        pass
+
+
+def serve(directory, host="localhost", port=8888):
+    handler = functools.partial(QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving {directory} at http://{host}:{server.server_port}/")
+    return server
+
+
+def try_build(build):
+    try:
+        build()
+    except (OSError, ValueError) as exc:
+        print(f"Build failed: {exc!r}")
+        for note in getattr(exc, "__notes__", []):
+            print(f"  {note}")
+        return False
+    return True
+
+
+def watch(paths, rebuild, interval=0.1, stop=None, previous=None):
+    if previous is None:
+        previous = snapshot(paths)
+    while stop is None or not stop.is_set():
+        time.sleep(interval)
+        current = snapshot(paths)
+        changed = changed_files(previous, current)
+        if not changed:
+            continue
+
+        previous = current
+        print(f"Changed: {', '.join(str(path) for path in changed)}")
+        start = time.perf_counter()
+        if try_build(functools.partial(rebuild, changed)):
+            print(f"Rebuilt in {(time.perf_counter() - start) * 1000:.1f} ms")